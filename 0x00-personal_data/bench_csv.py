@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Benchmark of column-aware CSV redaction against filter_datum"""
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+
+from filtered_logger import CsvRedactor, PII_FIELDS, filter_datum
+
+CSV_FILE = "user_data.csv"
+DEFAULT_ROWS = 1000000
+
+
+def build_csv(file_path: str, row_count: int) -> None:
+    """
+    Writes user_data.csv with its rows repeated up to ``row_count``.
+    """
+    with open(CSV_FILE, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        sample = list(reader)
+    with open(file_path, 'w', newline='') as f:
+        csv.writer(f, lineterminator="\n").writerow(header)
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        for i in range(row_count):
+            writer.writerow(sample[i % len(sample)])
+
+
+def regex_redaction(file_path: str) -> int:
+    """
+    Redacts every row by joining it into a ``key=value;`` message and
+    running filter_datum on it, as the logger does.
+    """
+    fields = list(PII_FIELDS)
+    count = 0
+    output = io.StringIO()
+    with open(file_path, newline='') as f:
+        for row in csv.DictReader(f):
+            message = "".join(
+                "{}={};".format(key, value) for key, value in row.items())
+            output.write(filter_datum(fields, "***", message, ";"))
+            output.write("\n")
+            count += 1
+    return count
+
+
+def column_redaction(file_path: str) -> int:
+    """
+    Redacts the file with CsvRedactor.redact_file.
+    """
+    output = io.StringIO()
+    with open(file_path, newline='') as f:
+        return CsvRedactor.redact_file(f, output)
+
+
+def run(row_count: int) -> None:
+    """
+    Prints the time taken by both approaches over ``row_count`` rows.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        file_path = os.path.join(tmp, "users.csv")
+        build_csv(file_path, row_count)
+        print("{} rows, {:.1f} MB".format(
+            row_count, os.path.getsize(file_path) / 1e6))
+        for name, redact in (("filter_datum", regex_redaction),
+                             ("CsvRedactor", column_redaction)):
+            start = time.perf_counter()
+            assert redact(file_path) == row_count
+            elapsed = time.perf_counter() - start
+            print("{:>13} {:>7.2f}s {:>10.0f} rows/s".format(
+                name, elapsed, row_count / elapsed))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Benchmark of buffered versus streamed users exports on SQLite"""
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+from filtered_logger import (PII_FIELDS, USER_COLUMNS, redact_batch,
+                             stream_rows)
+from sqlite_db import SQLiteConnection
+
+CSV_FILE = "user_data.csv"
+ROW_COUNTS = (10000, 100000)
+CHUNK_SIZES = (100, 1000, 10000)
+
+
+def build_database(file_path: str, row_count: int) -> None:
+    """
+    Fills a SQLite users table with copies of the user_data.csv rows.
+
+    Args:
+        file_path (str): SQLite database file.
+        row_count (int): Number of rows to insert.
+    """
+    with open(CSV_FILE, newline='') as f:
+        sample = [tuple(row[c] for c in USER_COLUMNS)
+                  for row in csv.DictReader(f)]
+    db = SQLiteConnection(file_path)
+    cursor = db.cursor()
+    cursor.execute("CREATE TABLE users ({})".format(
+        ", ".join("{} TEXT".format(c) for c in USER_COLUMNS)))
+    cursor.executemany(
+        "INSERT INTO users VALUES ({})".format(
+            ", ".join("?" * len(USER_COLUMNS))),
+        (sample[i % len(sample)] for i in range(row_count)))
+    db.commit()
+    db.close()
+
+
+def buffered_export(file_path: str) -> int:
+    """
+    Exports the way main used to: SELECT * then iterate all rows.
+    """
+    db = SQLiteConnection(file_path)
+    cursor = db.cursor(dictionary=True)
+    cursor.execute("SELECT * FROM users")
+    rows = cursor.fetchall()
+    count = sum(len(chunk) for chunk in redact_batch(rows, PII_FIELDS))
+    db.close()
+    return count
+
+
+def streamed_export(file_path: str, chunk_size: int) -> int:
+    """
+    Exports through stream_rows with the given fetchmany size.
+    """
+    db = SQLiteConnection(file_path)
+    rows = stream_rows(db, chunk_size=chunk_size)
+    count = sum(len(chunk) for chunk in redact_batch(rows, PII_FIELDS))
+    db.close()
+    return count
+
+
+def measure(export: Callable[[], int]) -> Tuple[int, float, int]:
+    """
+    Runs an export, returning rows, seconds and peak traced bytes.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = export()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, elapsed, peak
+
+
+def run() -> None:
+    """
+    Prints time and peak memory of each export mode per table size.
+    """
+    print("{:>8} {:>14} {:>9} {:>11}".format(
+        "rows", "mode", "seconds", "peak KiB"))
+    with tempfile.TemporaryDirectory() as tmp:
+        for row_count in ROW_COUNTS:
+            file_path = os.path.join(tmp, "users_{}.db".format(row_count))
+            build_database(file_path, row_count)
+            modes = [("buffered", lambda: buffered_export(file_path))]
+            modes += [("stream/{}".format(size),
+                       lambda size=size: streamed_export(file_path, size))
+                      for size in CHUNK_SIZES]
+            for name, export in modes:
+                count, elapsed, peak = measure(export)
+                assert count == row_count
+                print("{:>8} {:>14} {:>9.2f} {:>11.0f}".format(
+                    row_count, name, elapsed, peak / 1024))
+
+
+if __name__ == "__main__":
+    run()
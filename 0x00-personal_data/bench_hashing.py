@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Benchmark of bcrypt verification throughput versus pool size"""
+import os
+import sys
+import time
+
+import bcrypt
+
+from encrypt_password import HashingService, is_valid
+
+DEFAULT_COST = 10
+VERIFICATIONS = 64
+
+
+def run(cost: int) -> None:
+    """
+    Prints verifications per second for several pool sizes.
+
+    Args:
+        cost (int): bcrypt work factor of the stored hash.
+    """
+    password = "MyAmazingPassw0rd"
+    hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt(cost))
+    cpus = os.cpu_count() or 1
+    print("cost {}, {} CPUs, {} verifications".format(
+        cost, cpus, VERIFICATIONS))
+    print("{:>8} {:>9} {:>12}".format("workers", "seconds", "verify/s"))
+    for workers in sorted({1, 2, 4, cpus, cpus * 2}):
+        service = HashingService(workers, VERIFICATIONS)
+        start = time.perf_counter()
+        futures = [service.submit(is_valid, hashed, password)
+                   for _ in range(VERIFICATIONS)]
+        assert all(future.result() for future in futures)
+        elapsed = time.perf_counter() - start
+        service.shutdown()
+        print("{:>8} {:>9.2f} {:>12.1f}".format(
+            workers, elapsed, VERIFICATIONS / elapsed))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_COST)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Throughput benchmark of the parallel CSV redaction pipeline"""
+import hashlib
+import os
+import tempfile
+import time
+
+from redact_csv import redact_file
+
+CSV_FILE = "user_data.csv"
+TARGET_BYTES = 64 * 1024 * 1024
+
+
+def build_csv(file_path: str, target_bytes: int) -> None:
+    """
+    Writes a copy of user_data.csv with its rows repeated until the
+    file reaches ``target_bytes``.
+    """
+    with open(CSV_FILE, 'rb') as f:
+        header = f.readline()
+        body = f.read()
+    if not body.endswith(b'\n'):
+        body += b'\n'
+    with open(file_path, 'wb') as f:
+        f.write(header)
+        for _ in range(max(target_bytes // len(body), 1)):
+            f.write(body)
+
+
+def run() -> None:
+    """
+    Prints MB/s of redact_file for 1, 2, 4 and CPU count workers.
+    """
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cpus})
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "users.csv")
+        output_path = os.path.join(tmp, "redacted.csv")
+        build_csv(input_path, TARGET_BYTES)
+        size = os.path.getsize(input_path)
+        print("input: {:.1f} MB, {} CPUs".format(size / 1e6, cpus))
+        print("{:>8} {:>9} {:>9}".format("workers", "seconds", "MB/s"))
+        digest = None
+        for workers in worker_counts:
+            start = time.perf_counter()
+            with open(output_path, 'wb') as output:
+                redact_file(input_path, output, workers)
+            elapsed = time.perf_counter() - start
+            with open(output_path, 'rb') as f:
+                current = hashlib.sha256(f.read()).hexdigest()
+            assert digest in (None, current), "output differs"
+            digest = current
+            print("{:>8} {:>9.2f} {:>9.1f}".format(
+                workers, elapsed, size / 1e6 / elapsed))
+
+
+if __name__ == "__main__":
+    run()
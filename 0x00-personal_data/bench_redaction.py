@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of the redaction backends"""
+import csv
+import timeit
+from typing import List
+
+from filtered_logger import PII_FIELDS, filter_datum, get_redaction_engine
+
+REDACTION = "***"
+SEPARATOR = ";"
+FIELD_COUNTS = (5, 50, 500, 5000)
+CSV_FILE = "user_data.csv"
+
+
+def build_message(field_count: int) -> str:
+    """
+    Builds a ``key=value;`` log line with the PII fields first.
+
+    Args:
+        field_count (int): Number of fields in the line.
+
+    Returns:
+        str: The log line.
+    """
+    keys: List[str] = list(PII_FIELDS)
+    keys += ["extra{}".format(i) for i in range(field_count - len(keys))]
+    return "".join("{}=value{};".format(key, i)
+                   for i, key in enumerate(keys[:field_count]))
+
+
+def check_csv_rows(fields: List[str]) -> int:
+    """
+    Checks that every backend matches filter_datum on user_data.csv.
+
+    Rows are joined the same way ``filtered_logger.main`` does.
+
+    Args:
+        fields (List[str]): Fields to obfuscate.
+
+    Returns:
+        int: Number of rows checked.
+    """
+    engines = [get_redaction_engine(tuple(fields), REDACTION, SEPARATOR, b)
+               for b in ("regex", "tokenize")]
+    count = 0
+    with open(CSV_FILE, newline='') as f:
+        for row in csv.DictReader(f):
+            message = "; ".join(
+                "{}={}".format(key, value) for key, value in row.items())
+            expected = filter_datum(fields, REDACTION, message, SEPARATOR)
+            for engine in engines:
+                assert engine.redact(message) == expected, message
+            count += 1
+    return count
+
+
+def run(number: int = 2000) -> None:
+    """
+    Times filter_datum against the cached redaction backends.
+
+    Args:
+        number (int): Calls per measurement, scaled down for long lines.
+    """
+    fields = list(PII_FIELDS)
+    print("checked {} rows of {}".format(check_csv_rows(fields), CSV_FILE))
+    print("{:>7} {:>14} {:>14} {:>14}".format(
+        "fields", "filter_datum", "regex", "tokenize"))
+    for count in FIELD_COUNTS:
+        message = build_message(count)
+        calls = max(number * 5 // count, 20)
+        timings = [timeit.timeit(
+            lambda: filter_datum(fields, REDACTION, message, SEPARATOR),
+            number=calls)]
+        for backend in ("regex", "tokenize"):
+            engine = get_redaction_engine(
+                tuple(fields), REDACTION, SEPARATOR, backend)
+            timings.append(timeit.timeit(
+                lambda: engine.redact(message), number=calls))
+        print("{:>7} {:>12.2f}us {:>12.2f}us {:>12.2f}us".format(
+            count, *(t / calls * 1e6 for t in timings)))
+
+
+if __name__ == "__main__":
+    run()
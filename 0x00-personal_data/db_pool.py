@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Connection pool"""
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+
+def ping(connection: Any) -> bool:
+    """
+    Default health check: runs ``SELECT 1`` on the connection.
+
+    Args:
+        connection: A DB-API style connection.
+
+    Returns:
+        bool: True if the query succeeded, False otherwise.
+    """
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+        cursor.close()
+        return True
+    except Exception:
+        return False
+
+
+class PooledConnection:
+    """
+    Proxy handed out by ConnectionPool.
+
+    Attribute access is forwarded to the real connection; ``close``
+    returns it to the pool instead of closing it.
+    """
+
+    def __init__(self, pool: 'ConnectionPool', connection: Any):
+        self._pool = pool
+        self._connection = connection
+
+    def __getattr__(self, name: str) -> Any:
+        if self._connection is None:
+            raise AttributeError("connection returned to pool")
+        return getattr(self._connection, name)
+
+    def __enter__(self) -> 'PooledConnection':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Returns the connection to the pool. Safe to call twice.
+        """
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            self._pool.release(connection)
+
+
+class ConnectionPool:
+    """
+    Bounded pool of connections built by a ``connect`` factory.
+
+    Connections are health checked on checkout and closed once they
+    have been idle for longer than ``idle_timeout`` seconds.
+    """
+
+    def __init__(
+            self,
+            connect: Callable[[], Any],
+            size: int = 5,
+            idle_timeout: float = 300.0,
+            health_check: Callable[[Any], bool] = ping):
+        if size < 1:
+            raise ValueError("size must be positive")
+        self._connect = connect
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self._health_check = health_check
+        self._idle = deque()
+        self._open = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stats = dict.fromkeys(
+            ("checkouts", "waits", "creations", "evictions",
+             "failed_checks"), 0)
+
+    def _evict_idle(self) -> None:
+        """
+        Closes connections idle past the timeout. Caller holds the lock.
+        """
+        deadline = time.monotonic() - self.idle_timeout
+        while self._idle and self._idle[0][1] < deadline:
+            connection, _ = self._idle.popleft()
+            self._discard(connection)
+            self._stats["evictions"] += 1
+
+    def _discard(self, connection: Any) -> None:
+        """
+        Closes a connection and frees its slot. Caller holds the lock.
+        """
+        self._open -= 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+        self._condition.notify()
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledConnection:
+        """
+        Checks a healthy connection out of the pool.
+
+        Args:
+            timeout (float, optional): Seconds to wait for a free slot,
+            forever if None.
+
+        Returns:
+            PooledConnection: Proxy whose ``close`` releases it.
+
+        Raises:
+            TimeoutError: If no connection became available in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("pool is closed")
+                self._evict_idle()
+                connection = None
+                if self._idle:
+                    # Most recently used first, so cold ones age out
+                    connection, _ = self._idle.pop()
+                elif self._open < self.size:
+                    self._open += 1
+                else:
+                    self._stats["waits"] += 1
+                    remaining = None if deadline is None \
+                        else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0 or \
+                            not self._condition.wait(remaining):
+                        raise TimeoutError("no connection available")
+                    continue
+
+            if connection is None:
+                try:
+                    connection = self._connect()
+                except Exception:
+                    with self._condition:
+                        self._open -= 1
+                        self._condition.notify()
+                    raise
+                with self._condition:
+                    self._stats["creations"] += 1
+            elif not self._health_check(connection):
+                with self._condition:
+                    self._stats["failed_checks"] += 1
+                    self._discard(connection)
+                continue
+
+            with self._condition:
+                self._stats["checkouts"] += 1
+            return PooledConnection(self, connection)
+
+    def release(self, connection: Any) -> None:
+        """
+        Puts a connection back in the pool.
+
+        Args:
+            connection: The raw connection, as wrapped by acquire.
+        """
+        with self._condition:
+            if self._closed:
+                self._discard(connection)
+                return
+            self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def close(self) -> None:
+        """
+        Closes every idle connection; busy ones close on release.
+        """
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.popleft()[0])
+            self._condition.notify_all()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """
+        Counters of pool activity plus current open and idle counts.
+        """
+        with self._condition:
+            stats = dict(self._stats)
+            stats["open"] = self._open
+            stats["idle"] = len(self._idle)
+        return stats
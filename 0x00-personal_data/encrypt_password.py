@@ -1,7 +1,83 @@
 #!/usr/bin/env python3
 """Hash password"""
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
 import bcrypt
 
+# bcrypt.gensalt() default: calibration never weakens new hashes below
+# it, a lower cost must be set explicitly through BCRYPT_COST
+MIN_COST = 12
+MAX_COST = 16
+DEFAULT_TARGET_MS = 250
+
+_cost = None
+_cost_lock = threading.Lock()
+
+
+def calibrate_cost(
+        target_seconds: float = DEFAULT_TARGET_MS / 1000,
+        min_cost: int = MIN_COST,
+        max_cost: int = MAX_COST) -> int:
+    """
+    Picks the highest bcrypt cost whose hash time fits a target.
+
+    Each cost step doubles the work, so measuring stops as soon as the
+    next step is predicted to exceed the target.
+
+    Args:
+        target_seconds (float): Latency budget of one hash.
+        min_cost (int): Lowest cost ever returned, bcrypt's default
+            of 12 unless lowered explicitly.
+        max_cost (int): Highest cost ever returned.
+
+    Returns:
+        int: The calibrated cost.
+    """
+    cost = min_cost
+    while True:
+        start = time.perf_counter()
+        bcrypt.hashpw(b"calibration", bcrypt.gensalt(cost))
+        elapsed = time.perf_counter() - start
+        if elapsed > target_seconds:
+            return max(cost - 1, min_cost)
+        if cost >= max_cost or elapsed * 2 > target_seconds:
+            return cost
+        cost += 1
+
+
+def get_cost() -> int:
+    """
+    Returns the bcrypt cost used for new hashes.
+
+    BCRYPT_COST fixes it, and is the only way to go below bcrypt's
+    default of 12; otherwise it is calibrated once against
+    BCRYPT_TARGET_MS (default 250) on first use, never below 12.
+    """
+    global _cost
+    with _cost_lock:
+        if _cost is None:
+            if os.getenv('BCRYPT_COST'):
+                _cost = int(os.getenv('BCRYPT_COST'))
+            else:
+                _cost = calibrate_cost(int(os.getenv(
+                    'BCRYPT_TARGET_MS', DEFAULT_TARGET_MS)) / 1000)
+        return _cost
+
+
+def hash_cost(hashed_password: bytes) -> int:
+    """
+    Returns the cost a bcrypt hash was made with.
+
+    Args:
+        hashed_password (bytes): A hash such as ``$2b$12$...``.
+    """
+    return int(hashed_password.split(b"$")[2])
+
 
 def hash_password(password: str) -> bytes:
     """
@@ -13,7 +89,7 @@ def hash_password(password: str) -> bytes:
     Returns:
         bytes: The salted, hashed password.
     """
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(get_cost())
     hashed_password = bcrypt.hashpw(password.encode(), salt)
     return hashed_password
 
@@ -32,3 +108,166 @@ def is_valid(hashed_password: bytes, password: str) -> bool:
     """
     # Use bcrypt's checkpw function to verify the password
     return bcrypt.checkpw(password.encode(), hashed_password)
+
+
+def needs_rehash(hashed_password: bytes) -> bool:
+    """
+    Tells whether a hash uses a lower cost than the current one.
+
+    Args:
+        hashed_password (bytes): The salted, hashed password.
+
+    Returns:
+        bool: True if the password should be hashed again.
+    """
+    return hash_cost(hashed_password) < get_cost()
+
+
+def verify_and_update(
+        hashed_password: bytes,
+        password: str) -> Tuple[bool, Optional[bytes]]:
+    """
+    Validates a password and rehashes it if its cost is outdated.
+
+    Args:
+        hashed_password (bytes): The stored, hashed password.
+        password (str): The plain text password to validate.
+
+    Returns:
+        Tuple[bool, Optional[bytes]]: Whether the password is valid,
+        and a new hash to store when it was valid but outdated.
+    """
+    if not is_valid(hashed_password, password):
+        return False, None
+    if needs_rehash(hashed_password):
+        return True, hash_password(password)
+    return True, None
+
+
+class HashingBusy(Exception):
+    """
+    Raised when the hashing service already has ``max_pending`` tasks.
+    """
+
+
+class HashingService:
+    """
+    Runs bcrypt on a bounded thread pool.
+
+    bcrypt releases the GIL while hashing, so threads scale across
+    cores. At most ``max_pending`` tasks may be queued or running;
+    further submissions wait for a slot or raise HashingBusy.
+    """
+
+    def __init__(self, max_workers: int = None, max_pending: int = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self._executor = ThreadPoolExecutor(
+            self.max_workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def submit(self, fn: Callable, *args,
+               timeout: Optional[float] = None) -> Future:
+        """
+        Schedules ``fn(*args)`` on the pool.
+
+        Args:
+            fn (Callable): Function to run.
+            timeout (float, optional): Seconds to wait for a free slot,
+            forever if None and not at all if 0.
+
+        Returns:
+            Future: Result of the call.
+
+        Raises:
+            HashingBusy: If no slot was freed in time.
+        """
+        if not self._slots.acquire(timeout=timeout):
+            raise HashingBusy("{} hashing tasks pending".format(
+                self.max_pending))
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stops the worker threads.
+        """
+        self._executor.shutdown(wait=wait)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_hashing_service() -> HashingService:
+    """
+    Returns the shared HashingService, sized from the
+    BCRYPT_MAX_WORKERS and BCRYPT_MAX_PENDING environment variables.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = HashingService(
+                int(os.getenv('BCRYPT_MAX_WORKERS', 0)),
+                int(os.getenv('BCRYPT_MAX_PENDING', 0)))
+        return _service
+
+
+def submit_hash_password(password: str,
+                         timeout: Optional[float] = None) -> Future:
+    """
+    Hashes a password on the shared pool.
+
+    Args:
+        password (str): The plain text password to hash.
+        timeout (float, optional): Seconds to wait for a free slot.
+
+    Returns:
+        Future: Resolves to the salted, hashed password.
+    """
+    return get_hashing_service().submit(
+        hash_password, password, timeout=timeout)
+
+
+def submit_is_valid(hashed_password: bytes, password: str,
+                    timeout: Optional[float] = None) -> Future:
+    """
+    Validates a password on the shared pool.
+
+    Args:
+        hashed_password (bytes): The salted, hashed password.
+        password (str): The plain text password to validate.
+        timeout (float, optional): Seconds to wait for a free slot.
+
+    Returns:
+        Future: Resolves to True if the password matches.
+    """
+    return get_hashing_service().submit(
+        is_valid, hashed_password, password, timeout=timeout)
+
+
+async def hash_password_async(password: str) -> bytes:
+    """
+    Awaitable hash_password running on the shared pool.
+
+    Never blocks the event loop: raises HashingBusy right away when
+    the pool is saturated so callers can shed load.
+    """
+    return await asyncio.wrap_future(
+        submit_hash_password(password, timeout=0))
+
+
+async def is_valid_async(hashed_password: bytes, password: str) -> bool:
+    """
+    Awaitable is_valid running on the shared pool.
+
+    Never blocks the event loop: raises HashingBusy right away when
+    the pool is saturated so callers can shed load.
+    """
+    return await asyncio.wrap_future(
+        submit_is_valid(hashed_password, password, timeout=0))
@@ -1,14 +1,28 @@
 #!/usr/bin/env python3
 """Regex-ing"""
+import atexit
+import csv
+import io
 import os
+import queue
 import re
 import mysql.connector
 import logging
+import threading
+from db_pool import ConnectionPool, PooledConnection
+from functools import lru_cache
+from itertools import islice
+from logging.handlers import QueueHandler, QueueListener
+from sqlite_db import get_sqlite_db
 from mysql.connector.connection import MySQLConnection
-from typing import List
+from typing import (Dict, Iterable, Iterator, List, Mapping, Sequence,
+                    TextIO, Union)
 
 # Define PII fields
 PII_FIELDS = ("name", "email", "phone", "ssn", "password")
+# Columns of the users table, in the order they are logged
+USER_COLUMNS = PII_FIELDS + ("ip", "last_login", "user_agent")
+DEFAULT_FETCH_SIZE = 1000
 
 
 def filter_datum(
@@ -32,6 +46,175 @@ def filter_datum(
                   r'\1={}{}'.format(redaction, separator), message)
 
 
+class RedactionEngine:
+    """
+    Redacts ``field=value`` pairs with a pattern compiled once.
+
+    Equivalent to ``filter_datum`` for the same arguments, but the
+    regex is built at construction time instead of on every call.
+    """
+
+    def __init__(
+            self,
+            fields: Sequence[str],
+            redaction: str,
+            separator: str):
+        self.fields = tuple(fields)
+        self.redaction = redaction
+        self.separator = separator
+        self._pattern = re.compile(
+            r'({})=(.*?){}'.format('|'.join(self.fields), separator))
+        self._replacement = r'\1={}{}'.format(redaction, separator)
+
+    def redact(self, message: str) -> str:
+        """
+        Obfuscates the configured fields in a log message.
+
+        Args:
+            message (str): Log line to process.
+
+        Returns:
+            str: Obfuscated log message.
+        """
+        return self._pattern.sub(self._replacement, message)
+
+
+class TokenizingRedactor:
+    """
+    Redacts ``field=value`` pairs without regex.
+
+    Each PII field is located with ``str.find`` and only those
+    occurrences are checked to be the key of their token, so the work
+    done in Python grows with the number of PII values rather than with
+    the number of fields in the line. Unlike the regex backend, a final
+    field without a trailing separator is redacted.
+    """
+
+    def __init__(
+            self,
+            fields: Sequence[str],
+            redaction: str,
+            separator: str):
+        self.fields = frozenset(fields)
+        self.redaction = redaction
+        self.separator = separator
+        # Token boundaries only follow from splitting left to right when
+        # the separator overlaps itself (e.g. '::'), a field or '='
+        self._split = bool(set(separator) & set("=".join(fields) + "=")) \
+            or any(separator.startswith(separator[i:])
+                   for i in range(1, len(separator)))
+
+    def _value_start(self, message: str, start: int, field: str) -> int:
+        """
+        Returns where the value of the field found at ``start`` begins,
+        or -1 if that field is not the key of its token.
+
+        The key is the last word before the first '=' of the token, so
+        the field must start a word, be followed by '=' after optional
+        whitespace, and no '=' may precede it in the token.
+        """
+        separator = self.separator
+        if start and not message[start - 1].isspace() and \
+                not message.endswith(separator, 0, start):
+            return -1
+        after = start + len(field)
+        equals = message.find('=', after)
+        if equals == -1 or (equals != after and (
+                not message[after:equals].isspace() or
+                separator in message[after:equals])):
+            return -1
+        token_start = message.rfind(separator, 0, start)
+        token_start = 0 if token_start == -1 \
+            else token_start + len(separator)
+        if message.find('=', token_start, start) != -1:
+            return -1
+        return equals + 1
+
+    def redact(self, message: str) -> str:
+        """
+        Obfuscates the configured fields in a log message.
+
+        Args:
+            message (str): Log line to process.
+
+        Returns:
+            str: Obfuscated log message.
+        """
+        separator = self.separator
+        if self._split:
+            return self._redact_tokens(message)
+        spans = []
+        for field in self.fields:
+            start = message.find(field)
+            while start != -1:
+                value_start = self._value_start(message, start, field)
+                if value_start == -1:
+                    start = message.find(field, start + 1)
+                    continue
+                end = message.find(separator, value_start)
+                if end == -1:
+                    end = len(message)
+                spans.append((value_start, end))
+                start = message.find(field, end)
+        if not spans:
+            return message
+        spans.sort()
+        output = []
+        position = 0
+        for start, end in spans:
+            output.append(message[position:start])
+            output.append(self.redaction)
+            position = end
+        output.append(message[position:])
+        return "".join(output)
+
+    def _redact_tokens(self, message: str) -> str:
+        """
+        Splits the message into tokens and redacts each one.
+        """
+        tokens = message.split(self.separator)
+        for i, token in enumerate(tokens):
+            key, equals, _ = token.partition('=')
+            if equals:
+                words = key.rsplit(None, 1)
+                if words and words[-1] in self.fields:
+                    tokens[i] = key + equals + self.redaction
+        return self.separator.join(tokens)
+
+
+REDACTION_BACKENDS = {
+    "regex": RedactionEngine,
+    "tokenize": TokenizingRedactor,
+}
+
+
+@lru_cache(maxsize=64)
+def get_redaction_engine(
+        fields: Sequence[str],
+        redaction: str,
+        separator: str,
+        backend: str = "regex"):
+    """
+    Returns a shared redaction engine for the given configuration.
+
+    Engines are kept in a bounded LRU cache keyed by
+    (fields, redaction, separator, backend), so ``fields`` must be
+    hashable.
+
+    Args:
+        fields (Sequence[str]): Fields to obfuscate, as a tuple.
+        redaction (str): String representing the obfuscation value.
+        separator (str): Character separating fields in the log line.
+        backend (str): Name of a REDACTION_BACKENDS entry.
+
+    Returns:
+        The engine, exposing ``redact(message)``.
+    """
+    if backend not in REDACTION_BACKENDS:
+        raise ValueError("Unknown redaction backend: {}".format(backend))
+    return REDACTION_BACKENDS[backend](fields, redaction, separator)
+
+
 class RedactingFormatter(logging.Formatter):
     """ Redacting Formatter class
     """
@@ -40,9 +223,11 @@ class RedactingFormatter(logging.Formatter):
     FORMAT = "[HOLBERTON] %(name)s %(levelname)s %(asctime)-15s: %(message)s"
     SEPARATOR = ";"
 
-    def __init__(self, fields: List[str]):
+    def __init__(self, fields: List[str], backend: str = "regex"):
         super(RedactingFormatter, self).__init__(self.FORMAT)
         self.fields = fields
+        self.engine = get_redaction_engine(
+            tuple(fields), self.REDACTION, self.SEPARATOR, backend)
 
     def format(self, record: logging.LogRecord) -> str:
         """
@@ -57,32 +242,342 @@ class RedactingFormatter(logging.Formatter):
 
         """
         original_message = super().format(record)
-        return filter_datum(
-            self.fields,
-            self.REDACTION,
-            original_message,
-            self.SEPARATOR)
+        return self.engine.redact(original_message)
+
+
+def redact_row(
+        row: Mapping[str, object],
+        fields: Iterable[str],
+        redaction: str = RedactingFormatter.REDACTION) -> str:
+    """
+    Redacts a row dict and joins it the way ``main`` logs rows.
+
+    PII values are replaced before the string is built, so the
+    message never needs to be scanned again.
+
+    Args:
+        row (Mapping[str, object]): Column name to value mapping.
+        fields (Iterable[str]): Fields to obfuscate.
+        redaction (str): String representing the obfuscation value.
+
+    Returns:
+        str: Redacted ``key=value; ...`` message.
+    """
+    fields = fields if isinstance(fields, frozenset) else frozenset(fields)
+    return "; ".join(
+        "{}={}".format(key, redaction if key in fields else value)
+        for key, value in row.items())
+
+
+def redact_batch(
+        rows: Iterable[Union[Mapping[str, object], str]],
+        fields: Sequence[str],
+        chunk_size: int = 1000,
+        backend: str = "regex") -> Iterator[List[str]]:
+    """
+    Redacts rows in bulk, yielding lists of at most ``chunk_size``.
+
+    Dict rows are redacted structurally with ``redact_row``; string
+    rows are treated as pre-joined messages and go through the
+    cached redaction engine.
+
+    Args:
+        rows (Iterable): Row dicts or pre-joined log messages.
+        fields (Sequence[str]): Fields to obfuscate.
+        chunk_size (int): Maximum number of messages per chunk.
+        backend (str): Engine used for pre-joined messages.
+
+    Yields:
+        List[str]: Redacted messages, in input order.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    field_set = frozenset(fields)
+    engine = get_redaction_engine(
+        tuple(fields), RedactingFormatter.REDACTION,
+        RedactingFormatter.SEPARATOR, backend)
+    chunk = []
+    for row in rows:
+        if isinstance(row, str):
+            chunk.append(engine.redact(row))
+        else:
+            chunk.append(redact_row(row, field_set))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
 
-def get_logger() -> logging.Logger:
+class CsvRedactor:
+    """
+    Redacts PII columns of CSV rows by column index.
+
+    The header is resolved to column indices once; rows are then
+    redacted by replacing those cells, grouped into contiguous slices,
+    with no regex or string rescanning.
+    """
+
+    def __init__(
+            self,
+            header: Sequence[str],
+            fields: Sequence[str] = PII_FIELDS,
+            redaction: str = RedactingFormatter.REDACTION):
+        self.header = list(header)
+        self.redaction = redaction
+        self.indices = tuple(
+            i for i, column in enumerate(self.header) if column in fields)
+        self.width = self.indices[-1] + 1 if self.indices else 0
+        # Contiguous runs of indices, replaced with one slice each
+        self._runs = []
+        for i in self.indices:
+            if self._runs and self._runs[-1][1] == i:
+                self._runs[-1][1] = i + 1
+            else:
+                self._runs.append([i, i + 1])
+        self._fills = [(slice(start, stop), [redaction] * (stop - start))
+                       for start, stop in self._runs]
+
+    def redact_rows(self, rows: Iterable[List[str]]) -> List[List[str]]:
+        """
+        Redacts a chunk of parsed rows in place.
+
+        Args:
+            rows (Iterable[List[str]]): Rows as returned by csv.reader.
+
+        Returns:
+            List[List[str]]: The same rows, redacted.
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        fills = self._fills
+        width = self.width
+        redaction = self.redaction
+        for row in rows:
+            if len(row) >= width:
+                for columns, fill in fills:
+                    row[columns] = fill
+            else:
+                for i in self.indices:
+                    if i < len(row):
+                        row[i] = redaction
+        return rows
+
+    def redact_text(self, text: str, lineterminator: str = '\n') -> str:
+        """
+        Redacts a block of whole CSV records without header.
+
+        Args:
+            text (str): CSV records.
+            lineterminator (str): Line ending of the output.
+
+        Returns:
+            str: The redacted records, every field quoted.
+        """
+        output = io.StringIO()
+        writer = csv.writer(output, quoting=csv.QUOTE_ALL,
+                            lineterminator=lineterminator)
+        writer.writerows(
+            self.redact_rows(csv.reader(io.StringIO(text, newline=''))))
+        return output.getvalue()
+
+    @classmethod
+    def redact_file(
+            cls,
+            infile: TextIO,
+            outfile: TextIO,
+            fields: Sequence[str] = PII_FIELDS,
+            chunk_rows: int = 10000) -> int:
+        """
+        Redacts a CSV stream with a header line into another stream.
+
+        Both files should be opened with ``newline=''``.
+
+        Args:
+            infile (TextIO): CSV input, header first.
+            outfile (TextIO): Destination of the redacted CSV.
+            fields (Sequence[str]): Columns to obfuscate.
+            chunk_rows (int): Rows read and written per chunk.
+
+        Returns:
+            int: Number of data rows written.
+        """
+        reader = csv.reader(infile)
+        header = next(reader, None)
+        if header is None:
+            return 0
+        redactor = cls(header, fields)
+        csv.writer(outfile, lineterminator="\n").writerow(header)
+        writer = csv.writer(outfile, quoting=csv.QUOTE_ALL,
+                            lineterminator="\n")
+        count = 0
+        while True:
+            chunk = redactor.redact_rows(islice(reader, chunk_rows))
+            if not chunk:
+                return count
+            writer.writerows(chunk)
+            count += len(chunk)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler for a bounded queue.
+
+    With ``block`` False, records arriving while the queue is full are
+    dropped and counted instead of blocking the caller.
+    """
+
+    def __init__(self, log_queue: queue.Queue, block: bool = False):
+        super().__init__(log_queue)
+        self.block = block
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        """
+        Puts a record on the queue according to the block policy.
+        """
+        try:
+            self.queue.put(record, block=self.block)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class BatchingStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that buffers formatted records and writes them
+    in one call every ``batch_size`` records or on flush.
+    """
+
+    def __init__(self, stream=None, batch_size: int = 100):
+        super().__init__(stream)
+        self.batch_size = batch_size
+        self._buffer = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """
+        Formats a record into the buffer, flushing it when full.
+        """
+        try:
+            self._buffer.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes out every buffered record.
+        """
+        self.acquire()
+        try:
+            if self._buffer and self.stream:
+                self.stream.write("".join(self._buffer))
+                self._buffer = []
+            super().flush()
+        finally:
+            self.release()
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    QueueListener that flushes its handlers whenever the queue drains,
+    so records are batched under load but never held back when idle.
+    """
+
+    def handle(self, record: logging.LogRecord) -> None:
+        """
+        Handles a record, flushing handlers if nothing else is queued.
+        """
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+    def stop(self) -> None:
+        """
+        Drains the queue, stops the thread and flushes handlers.
+        """
+        super().stop()
+        for handler in self.handlers:
+            handler.flush()
+
+
+_listener = None
+
+
+def get_logger(
+        asynchronous: bool = False,
+        queue_size: int = 10000,
+        block: bool = False) -> logging.Logger:
     """
     Creates and returns a logger object with specific configuration.
 
+    The logger is configured once; later calls return it unchanged
+    and raise ValueError if they ask for another configuration.
+    In asynchronous mode callers only enqueue records and a background
+    listener thread redacts and writes them in batches.
+
+    Args:
+        asynchronous (bool): Use a QueueHandler and QueueListener.
+        queue_size (int): Maximum number of queued records.
+        block (bool): Block callers when the queue is full instead of
+        dropping records.
+
     Returns:
         logging.Logger: Configured logger object.
     """
+    global _listener
     logger = logging.getLogger("user_data")
+    if logger.handlers:
+        handler = next((h for h in logger.handlers
+                        if isinstance(h, DroppingQueueHandler)), None)
+        if handler is None:
+            if asynchronous:
+                raise ValueError("Logger already configured as "
+                                 "synchronous")
+        elif (not asynchronous or handler.queue.maxsize != queue_size
+              or handler.block != block):
+            raise ValueError("Logger already configured as asynchronous "
+                             "with queue_size={}, block={}".format(
+                                 handler.queue.maxsize, handler.block))
+        return logger
     logger.setLevel(logging.INFO)
     logger.propagate = False
 
-    stream_handler = logging.StreamHandler()
     formatter = RedactingFormatter(list(PII_FIELDS))
-    stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
+    if not asynchronous:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setFormatter(formatter)
+        logger.addHandler(stream_handler)
+        return logger
 
+    log_queue = queue.Queue(maxsize=queue_size)
+    stream_handler = BatchingStreamHandler()
+    stream_handler.setFormatter(formatter)
+    _listener = BatchingQueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+    logger.addHandler(DroppingQueueHandler(log_queue, block))
     return logger
 
 
+def get_logger_stats() -> Dict[str, int]:
+    """
+    Returns queue depth and dropped record count of the async logger.
+
+    Returns:
+        Dict[str, int]: ``queue_depth`` and ``dropped``, both 0 when
+        the logger is not asynchronous.
+    """
+    for handler in logging.getLogger("user_data").handlers:
+        if isinstance(handler, DroppingQueueHandler):
+            return {"queue_depth": handler.queue.qsize(),
+                    "dropped": handler.dropped}
+    return {"queue_depth": 0, "dropped": 0}
+
+
 def get_db() -> MySQLConnection:
     """
     Creates and returns a connection to the database using credentials
@@ -107,30 +602,109 @@ def get_db() -> MySQLConnection:
     return connection
 
 
-def main() -> None:
+DB_BACKENDS = {
+    "mysql": get_db,
+    "sqlite": get_sqlite_db,
+}
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    """
+    Returns the process-wide connection pool, creating it on first use.
+
+    The pool is configured from environment variables:
+    PERSONAL_DATA_DB_BACKEND (``mysql`` or ``sqlite``),
+    PERSONAL_DATA_DB_POOL_SIZE and PERSONAL_DATA_DB_POOL_IDLE_TIMEOUT.
+    Connection credentials are the same as for get_db.
+
+    Returns:
+        ConnectionPool: The shared pool.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            backend = os.getenv('PERSONAL_DATA_DB_BACKEND', 'mysql')
+            if backend not in DB_BACKENDS:
+                raise ValueError("Unknown DB backend: {}".format(backend))
+            _pool = ConnectionPool(
+                DB_BACKENDS[backend],
+                size=int(os.getenv('PERSONAL_DATA_DB_POOL_SIZE', 5)),
+                idle_timeout=float(
+                    os.getenv('PERSONAL_DATA_DB_POOL_IDLE_TIMEOUT', 300)))
+        return _pool
+
+
+def get_pooled_db() -> PooledConnection:
+    """
+    Checks a connection out of the shared pool.
+
+    Calling ``close()`` on the result returns it to the pool, so it
+    is a drop-in replacement for get_db.
+
+    Returns:
+        PooledConnection: A healthy database connection.
+    """
+    return get_pool().acquire()
+
+
+def stream_rows(
+        db_connection,
+        columns: Sequence[str] = USER_COLUMNS,
+        chunk_size: int = DEFAULT_FETCH_SIZE) -> Iterator[dict]:
+    """
+    Streams rows of the users table through an unbuffered cursor.
+
+    Only ``columns`` are selected and rows are pulled from the server
+    ``chunk_size`` at a time, so client memory stays flat whatever
+    the size of the table.
+
+    Args:
+        db_connection: A connection as returned by get_db.
+        columns (Sequence[str]): Columns to select, from USER_COLUMNS.
+        chunk_size (int): Number of rows per fetchmany call.
+
+    Yields:
+        dict: One row, keyed by column name.
+    """
+    unknown = set(columns) - set(USER_COLUMNS)
+    if unknown:
+        raise ValueError("Unknown columns: {}".format(sorted(unknown)))
+    cursor = db_connection.cursor(dictionary=True, buffered=False)
+    try:
+        cursor.execute("SELECT {} FROM users".format(", ".join(columns)))
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        cursor.close()
+
+
+def main(chunk_size: int = DEFAULT_FETCH_SIZE) -> None:
     """
     Main function that retrieves all rows in the users table
     and displays each row under a filtered format.
+
+    Args:
+        chunk_size (int): Number of rows fetched from the server at once.
     """
     # Get database connection
     db_connection = get_db()
-    cursor = db_connection.cursor(dictionary=True)
-
-    # Execute query to retrieve all rows from the users table
-    cursor.execute("SELECT * FROM users")
 
     # Get logger
     logger = get_logger()
 
-    # Fetch and log each row
-    for row in cursor:
+    # Stream and log each row
+    for row in stream_rows(db_connection, chunk_size=chunk_size):
         message = "; ".join([f"{key}={value}" for key, value in row.items()])
         logger.info(message)
 
-    # Close cursor and connection
-    cursor.close()
+    # Close connection
     db_connection.close()
 
 
 if __name__ == "__main__":
-    main()
+    main(int(os.getenv('PERSONAL_DATA_FETCH_SIZE', DEFAULT_FETCH_SIZE)))
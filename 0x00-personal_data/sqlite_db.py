@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""SQLite stand-in for the MySQL connection"""
+import os
+import sqlite3
+from typing import Sequence
+
+
+def _dict_row(cursor: sqlite3.Cursor, row: Sequence) -> dict:
+    """
+    Row factory returning rows as dicts keyed by column name.
+    """
+    return {column[0]: value
+            for column, value in zip(cursor.description, row)}
+
+
+class SQLiteConnection:
+    """
+    Wraps a sqlite3 connection with the subset of the
+    mysql.connector API used by filtered_logger.
+    """
+
+    def __init__(self, database: str = ":memory:"):
+        # Pooled connections may be checked out by any thread
+        self._connection = sqlite3.connect(
+            database, check_same_thread=False)
+
+    def cursor(self, dictionary: bool = False,
+               buffered: bool = False) -> sqlite3.Cursor:
+        """
+        Returns a cursor, yielding dict rows when ``dictionary`` is set.
+
+        sqlite3 cursors always step through results lazily, so
+        ``buffered`` is accepted for compatibility and ignored.
+        """
+        cursor = self._connection.cursor()
+        if dictionary:
+            cursor.row_factory = _dict_row
+        return cursor
+
+    def commit(self) -> None:
+        """
+        Commits the current transaction.
+        """
+        self._connection.commit()
+
+    def close(self) -> None:
+        """
+        Closes the underlying connection.
+        """
+        self._connection.close()
+
+
+def get_sqlite_db() -> SQLiteConnection:
+    """
+    Returns a SQLite connection to the file named by
+    PERSONAL_DATA_DB_NAME, or an in-memory database if unset.
+    """
+    return SQLiteConnection(os.getenv('PERSONAL_DATA_DB_NAME', ':memory:'))
@@ -4,8 +4,11 @@ Route module for the API
 """
 from os import getenv
 from api.v1.views import app_views
-from flask import Flask, jsonify, abort, request
+from flask import Flask, jsonify, abort, g, request
 from flask_cors import (CORS, cross_origin)
+from api.v1.auth.context import AuthContext
+from api.v1.auth.path_policy import PathPolicy
+from api.v1.auth.registry import LazyAuth
 from models.user_session import UserSession
 import os
 
@@ -16,21 +19,21 @@ CORS(app, resources={r"/api/v1/*": {"origins": "*"}})
 
 auth = None
 
-if os.getenv("AUTH_TYPE") == "auth":
-    from api.v1.auth.auth import Auth
-    auth = Auth()
-elif os.getenv("AUTH_TYPE") == "basic_auth":
-    from api.v1.auth.basic_auth import BasicAuth
-    auth = BasicAuth()
-elif os.getenv("AUTH_TYPE") == "session_auth":
-    from api.v1.auth.session_auth import SessionAuth
-    auth = SessionAuth()
-elif os.getenv("AUTH_TYPE") == "session_exp_auth":
-    from api.v1.auth.session_exp_auth import SessionExpAuth
-    auth = SessionExpAuth()
-elif os.getenv("AUTH_TYPE") == "session_db_auth":
-    from api.v1.auth.session_db_auth import SessionDBAuth
-    auth = SessionDBAuth()
+excluded_paths = PathPolicy([
+    '/api/v1/status/',
+    '/api/v1/unauthorized/',
+    '/api/v1/forbidden/',
+    '/api/v1/auth_session/login/'])
+
+if os.getenv("AUTH_TYPE"):
+    auth = LazyAuth(os.getenv("AUTH_TYPE"))
+
+if os.getenv("WRITE_BEHIND_INTERVAL"):
+    from models.base import enable_write_behind
+    enable_write_behind(float(os.getenv("WRITE_BEHIND_INTERVAL")),
+                        int(os.getenv("WRITE_BEHIND_MAX_PENDING", 100)))
+
+server_timing = bool(os.getenv("AUTH_SERVER_TIMING"))
 
 # Ensure session data is loaded on startup
 UserSession.load_from_file()
@@ -64,22 +67,30 @@ def before_request() -> str:
     """
     Filter for request
     """
-    request_path_list = [
-        '/api/v1/status/',
-        '/api/v1/unauthorized/',
-        '/api/v1/forbidden/',
-        '/api/v1/auth_session/login/']  # Add the new path here
     if auth:
-        if auth.require_auth(request.path, request_path_list):
-            if auth.authorization_header(request) is \
-                None and auth.session_cookie(
-                    request) is None:  # Check both conditions
+        context = g.auth_context = AuthContext(auth.backend, request)
+        if context.require_auth(excluded_paths):
+            if not context.has_credentials:
                 abort(401)
-            request.current_user = auth.current_user(request)
+            request.current_user = context.user
             if request.current_user is None:
                 abort(403)
 
 
+@app.after_request
+def after_request(response):
+    """
+    Report auth stage timings in a Server-Timing header when
+    AUTH_SERVER_TIMING is set
+    """
+    context = g.get("auth_context")
+    if context is not None and server_timing:
+        response.headers["Server-Timing"] = ", ".join(
+            "auth_{};dur={:.3f}".format(stage, seconds * 1000)
+            for stage, seconds in context.timings.items())
+    return response
+
+
 if __name__ == "__main__":
     host = getenv("API_HOST", "0.0.0.0")
     port = getenv("API_PORT", "5000")
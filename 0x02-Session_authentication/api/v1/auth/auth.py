@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 """ Auth module"""
+from api.v1.auth.path_policy import PathPolicy
 from flask import request
 from typing import List, TypeVar
 import os
@@ -25,11 +26,14 @@ class Auth:
         Args:
         - path (str): The path to check.
         - excluded_paths (List[str]): List of paths that
-          are excluded from authentication.
+          are excluded from authentication, or a PathPolicy
+          compiled from such a list.
 
         Returns:
         - bool: True if authentication is required, False otherwise.
         """
+        if isinstance(excluded_paths, PathPolicy):
+            return excluded_paths.require_auth(path)
         if path is None or excluded_paths is None or len(excluded_paths) == 0:
             return True
 
@@ -75,6 +79,26 @@ class Auth:
         """
         return None
 
+    def user_for_credentials(self, authorization_header: str = None,
+                             session_id: str = None,
+                             request=None) -> TypeVar('User'):
+        """
+        Resolves the user from credentials already read from a request.
+
+        Backends overriding only current_user are served through it.
+
+        Args:
+        - authorization_header (optional): The authorization header.
+        - session_id (optional): The session cookie value.
+        - request (optional): The request the credentials come from.
+
+        Returns:
+        - TypeVar('User'): The user, None if the credentials match none.
+        """
+        if request is None:
+            return None
+        return self.current_user(request)
+
     def session_cookie(self, request=None):
         """
         Retrieves the value of the cookie named
@@ -2,6 +2,7 @@
 """ Basic Auth Module
 """
 from api.v1.auth.auth import Auth
+from api.v1.auth.credential_cache import get_credential_cache
 from models.user import User
 from base64 import b64decode, decode
 from typing import TypeVar
@@ -80,8 +81,23 @@ class BasicAuth(Auth):
         """
         if request is None:
             return None
+        return self.user_for_credentials(self.authorization_header(request))
 
-        authorization_header = self.authorization_header(request)
+    def user_for_credentials(self, authorization_header: str = None,
+                             session_id: str = None,
+                             request=None) -> TypeVar('User'):
+        """
+        Retrieves the User instance for an Authorization header
+        Headers verified before are served from the credential cache
+        """
+        cache = get_credential_cache()
+        user_id = cache.get(authorization_header)
+        if user_id is not None:
+            user = User.get(user_id)
+            if user is not None:
+                return user
+
+        generation = cache.generation
         base64_authorization_header = self.extract_base64_authorization_header(
             authorization_header)
         decoded_base64_authorization_header = \
@@ -91,4 +107,6 @@ class BasicAuth(Auth):
             decoded_base64_authorization_header)
         user = self.user_object_from_credentials(user_email, user_pwd)
 
+        if user is not None:
+            cache.put(authorization_header, user.id, generation)
         return user
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+""" Per-request authentication context
+"""
+from flask import g, has_request_context
+from typing import Callable, TypeVar
+import time
+
+TIMING_HOOKS = []
+
+_UNRESOLVED = object()
+
+
+def add_timing_hook(hook: Callable) -> Callable:
+    """ Call hook(stage, seconds) each time an auth stage completes
+    """
+    if hook not in TIMING_HOOKS:
+        TIMING_HOOKS.append(hook)
+    return hook
+
+
+class AuthContext():
+    """ Authentication state of one request
+
+    The Authorization header and the session cookie are read once,
+    when the context is created. The user is resolved from them on
+    first access to user and then reused by the before_request hook
+    and every view. The time spent in each stage is kept in timings
+    and reported to the TIMING_HOOKS.
+    """
+
+    def __init__(self, auth, request):
+        """ Read the credentials of request
+        """
+        self.auth = auth
+        self.request = request
+        self.timings = {}
+        self._user = _UNRESOLVED
+        start = time.perf_counter()
+        self.authorization_header = auth.authorization_header(request)
+        self.session_id = auth.session_cookie(request)
+        self.record("credentials", time.perf_counter() - start)
+
+    def record(self, stage: str, seconds: float) -> None:
+        """ Record the duration of a stage
+        """
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+        for hook in TIMING_HOOKS:
+            hook(stage, seconds)
+
+    def require_auth(self, excluded_paths) -> bool:
+        """ True if the request path needs authentication
+        """
+        start = time.perf_counter()
+        required = self.auth.require_auth(self.request.path, excluded_paths)
+        self.record("require_auth", time.perf_counter() - start)
+        return required
+
+    @property
+    def has_credentials(self) -> bool:
+        """ True if the request carries a header or a session cookie
+        """
+        return self.authorization_header is not None or \
+            self.session_id is not None
+
+    @property
+    def user(self) -> TypeVar('User'):
+        """ User authenticated by the credentials, None if none is
+        """
+        if self._user is _UNRESOLVED:
+            start = time.perf_counter()
+            self._user = self.auth.user_for_credentials(
+                self.authorization_header, self.session_id, self.request)
+            self.record("user", time.perf_counter() - start)
+        return self._user
+
+
+def current_auth_context() -> AuthContext:
+    """ Context of the current request, None outside of one or when
+    no authentication is configured
+    """
+    if not has_request_context():
+        return None
+    return g.get("auth_context")
+
+
+def current_user() -> TypeVar('User'):
+    """ User authenticated for the current request, None if none is
+    """
+    context = current_auth_context()
+    return None if context is None else context.user
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+""" Cache of verified Basic credentials
+"""
+from collections import OrderedDict
+from models.base import add_change_listener
+import hashlib
+import os
+import threading
+import time
+
+
+class CredentialCache():
+    """ Bounded LRU cache mapping an Authorization header to the ID of
+    the user it was verified for
+
+    Headers are stored as a keyed BLAKE2 hash under a per-process
+    secret, so the cache never holds a usable credential. Entries
+    expire after ttl seconds and are dropped as soon as their user is
+    saved or removed.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0,
+                 secret: bytes = None):
+        """ Initialize an empty cache, max_size 0 disables it
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._secret = secret or os.urandom(32)
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._stats = dict.fromkeys(
+            ("hits", "misses", "expirations", "evictions",
+             "invalidations"), 0)
+
+    def _key(self, authorization_header: str) -> bytes:
+        """ Keyed hash of a header
+        """
+        return hashlib.blake2b(authorization_header.encode(),
+                               key=self._secret, digest_size=16).digest()
+
+    def _drop(self, key: bytes) -> None:
+        """ Remove an entry. Caller holds the lock.
+        """
+        user_id, _ = self._entries.pop(key)
+        keys = self._keys_by_user[user_id]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_user[user_id]
+
+    @property
+    def generation(self) -> int:
+        """ Token to take before verifying credentials and give to put()
+        """
+        return self._generation
+
+    def get(self, authorization_header: str) -> str:
+        """ User ID cached for a header, None if unknown or expired
+        """
+        if not self.max_size or authorization_header is None:
+            return None
+        key = self._key(authorization_header)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry[1] < time.monotonic():
+                self._drop(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def put(self, authorization_header: str, user_id: str,
+            generation: int) -> None:
+        """ Remember that a header was verified for user_id
+
+        Nothing is stored if a user changed since generation was read,
+        so a verification racing with a password change is not cached.
+        """
+        if not self.max_size or authorization_header is None:
+            return
+        key = self._key(authorization_header)
+        with self._lock:
+            if generation != self._generation:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (user_id, time.monotonic() + self.ttl)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._drop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def invalidate(self, user_id: str) -> None:
+        """ Forget every header verified for user_id
+        """
+        with self._lock:
+            self._generation += 1
+            for key in self._keys_by_user.pop(user_id, ()):
+                del self._entries[key]
+                self._stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        """ Forget every entry
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    @property
+    def stats(self) -> dict:
+        """ Counters plus the current size and hit ratio
+        """
+        with self._lock:
+            stats = dict(self._stats, size=len(self._entries))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def _on_change(obj, removed: bool) -> None:
+    """ Drop the cached credentials of a saved or removed user
+    """
+    from models.user import User
+
+    if _cache is not None and isinstance(obj, User):
+        _cache.invalidate(obj.id)
+
+
+def get_credential_cache() -> CredentialCache:
+    """ Process wide cache, sized by BASIC_AUTH_CACHE_SIZE (0 disables
+    it) with entries living BASIC_AUTH_CACHE_TTL seconds
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = CredentialCache(
+                    int(os.getenv("BASIC_AUTH_CACHE_SIZE", 1024)),
+                    float(os.getenv("BASIC_AUTH_CACHE_TTL", 60)))
+                add_change_listener(_on_change)
+    return _cache
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+""" Compiled excluded paths for Auth.require_auth
+"""
+from typing import Iterable
+
+MATCH = ""
+
+
+class PathPolicy():
+    """ Excluded paths compiled once for lookups in O(path length)
+
+    Follows Auth.require_auth: a trailing '/' is ignored on the path
+    and on the rules, a rule ending with '*' excludes every path
+    starting with the rest of the rule, and any other rule excludes
+    itself and the paths below it. Exact rules go in a set, prefixes
+    in a character trie where MATCH marks the end of a prefix.
+    """
+
+    def __init__(self, excluded_paths: Iterable[str] = ()):
+        """ Compile the excluded paths
+        """
+        self.excluded_paths = list(excluded_paths)
+        self._exact = set()
+        self._prefixes = {}
+        for excluded_path in self.excluded_paths:
+            if excluded_path.endswith('*'):
+                self._add_prefix(excluded_path[:-1])
+                continue
+            if excluded_path.endswith('/'):
+                excluded_path = excluded_path[:-1]
+            self._exact.add(excluded_path)
+            self._add_prefix(excluded_path + '/')
+
+    def _add_prefix(self, prefix: str) -> None:
+        """ Insert a prefix in the trie
+        """
+        node = self._prefixes
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[MATCH] = True
+
+    def __len__(self) -> int:
+        """ Number of rules
+        """
+        return len(self.excluded_paths)
+
+    def require_auth(self, path: str) -> bool:
+        """ True unless path is excluded from authentication
+        """
+        if path is None or not self.excluded_paths:
+            return True
+        if path.endswith('/'):
+            path = path[:-1]
+        if path in self._exact:
+            return False
+        node = self._prefixes
+        if MATCH in node:
+            return False
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                return True
+            if MATCH in node:
+                return False
+        return True
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+""" Registry of the authentication backends
+"""
+from api.v1.auth.auth import Auth
+from importlib import import_module
+from typing import List
+import threading
+
+ENTRY_POINT_GROUP = "api.v1.auth_backends"
+
+BACKENDS = {
+    "auth": "api.v1.auth.auth:Auth",
+    "basic_auth": "api.v1.auth.basic_auth:BasicAuth",
+    "session_auth": "api.v1.auth.session_auth:SessionAuth",
+    "session_exp_auth": "api.v1.auth.session_exp_auth:SessionExpAuth",
+    "session_db_auth": "api.v1.auth.session_db_auth:SessionDBAuth",
+}
+
+
+def register_backend(name: str, target) -> None:
+    """ Register an Auth class, or its "module:Class" path, under name
+    """
+    BACKENDS[name] = target
+
+
+def _entry_point(name: str) -> str:
+    """ "module:Class" path of an installed entry point, None if none
+    """
+    from importlib.metadata import entry_points
+
+    try:
+        found = entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:
+        found = entry_points().get(ENTRY_POINT_GROUP, ())
+    for entry_point in found:
+        if entry_point.name == name:
+            return entry_point.value
+    return None
+
+
+def backend_class(name: str) -> type:
+    """ Auth class registered under name, imported on first call
+    Names missing from BACKENDS are looked up in the entry points
+    """
+    target = BACKENDS.get(name) or _entry_point(name)
+    if target is None:
+        raise ValueError("Unknown auth backend: {}".format(name))
+    if isinstance(target, str):
+        module, _, attribute = target.partition(":")
+        target = getattr(import_module(module), attribute)
+        BACKENDS[name] = target
+    return target
+
+
+class ChainAuth(Auth):
+    """ Backends tried in order, the first user found wins
+
+    Sessions are created and destroyed by the first backend that
+    supports them.
+    """
+
+    def __init__(self, backends: List[Auth]):
+        """ Initialize the chain
+        """
+        self.backends = backends
+
+    def current_user(self, request=None):
+        """ User of the first backend accepting the request
+        """
+        if request is None:
+            return None
+        return self.user_for_credentials(self.authorization_header(request),
+                                         self.session_cookie(request),
+                                         request)
+
+    def user_for_credentials(self, authorization_header: str = None,
+                             session_id: str = None, request=None):
+        """ User of the first backend accepting the credentials
+        """
+        for backend in self.backends:
+            user = backend.user_for_credentials(authorization_header,
+                                                session_id, request)
+            if user is not None:
+                return user
+        return None
+
+    def __getattr__(self, name: str):
+        """ Attribute of the first backend providing it
+        """
+        for backend in self.__dict__.get("backends", ()):
+            if hasattr(backend, name):
+                return getattr(backend, name)
+        raise AttributeError(name)
+
+
+def create_auth(auth_type: str) -> Auth:
+    """ Auth for an AUTH_TYPE value, None if empty
+    Comma separated names build a ChainAuth, e.g.
+    "session_auth,basic_auth"
+    """
+    names = [name.strip() for name in (auth_type or "").split(",")
+             if name.strip()]
+    if not names:
+        return None
+    backends = [backend_class(name)() for name in names]
+    return backends[0] if len(backends) == 1 else ChainAuth(backends)
+
+
+class LazyAuth():
+    """ Stand-in for the Auth of an AUTH_TYPE, built on first use
+    """
+
+    def __init__(self, auth_type: str):
+        """ Check the backend names, nothing is imported yet
+        """
+        for name in auth_type.split(","):
+            name = name.strip()
+            if name and name not in BACKENDS and not _entry_point(name):
+                raise ValueError("Unknown auth backend: {}".format(name))
+        self.auth_type = auth_type
+        self._backend = None
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self) -> Auth:
+        """ The Auth, imported and built on first access
+        """
+        if self._backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = create_auth(self.auth_type)
+        return self._backend
+
+    def __getattr__(self, name: str):
+        """ Attribute of the built Auth
+        """
+        return getattr(self.backend, name)
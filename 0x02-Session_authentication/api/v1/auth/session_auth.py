@@ -2,13 +2,19 @@
 """ Module for Session Authentication """
 
 from api.v1.auth.auth import Auth
+from api.v1.auth.session_store import SessionStore, create_session_store
 import uuid
 from models.user import User
 
 
 class SessionAuth(Auth):
     """ Session Authentication Class """
-    user_id_by_session_id = {}
+    user_id_by_session_id = create_session_store()
+
+    def __init__(self, store: SessionStore = None):
+        """ Use store for the sessions instead of the shared one """
+        if store is not None:
+            self.user_id_by_session_id = store
 
     def create_session(self, user_id: str = None) -> str:
         """ Creates a Session ID for a user_id """
@@ -28,7 +34,12 @@ class SessionAuth(Auth):
         """ Returns a User instance based on a cookie value """
         if request is None:
             return None
-        session_id = self.session_cookie(request)
+        return self.user_for_credentials(
+            session_id=self.session_cookie(request))
+
+    def user_for_credentials(self, authorization_header: str = None,
+                             session_id: str = None, request=None):
+        """ Returns a User instance based on a session ID """
         user_id = self.user_id_for_session_id(session_id)
         if user_id is None:
             return None
@@ -44,5 +55,4 @@ class SessionAuth(Auth):
         user_id = self.user_id_for_session_id(session_id)
         if user_id is None:
             return False
-        del self.user_id_by_session_id[session_id]
-        return True
+        return self.user_id_by_session_id.pop(session_id, None) is not None
@@ -24,8 +24,8 @@ class SessionDBAuth(SessionExpAuth):
         if session_id is None:
             return None
 
-        # Ensure that UserSession data is loaded
-        UserSession.load_from_file()
+        # Reload UserSession data only if the file changed
+        UserSession.reload_if_changed()
 
         # Search for the session ID in UserSession
         sessions = UserSession.search({'session_id': session_id})
@@ -57,8 +57,8 @@ class SessionDBAuth(SessionExpAuth):
         if session_id is None:
             return False
 
-        # Ensure that UserSession data is loaded
-        UserSession.load_from_file()
+        # Reload UserSession data only if the file changed
+        UserSession.reload_if_changed()
 
         # Search for the session ID in UserSession
         sessions = UserSession.search({'session_id': session_id})
@@ -67,4 +67,5 @@ class SessionDBAuth(SessionExpAuth):
 
         session = sessions[0]
         session.remove()
+        self.user_id_by_session_id.pop(session_id, None)
         return True
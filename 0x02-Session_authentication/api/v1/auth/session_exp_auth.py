@@ -28,8 +28,8 @@ class SessionExpAuth(SessionAuth):
 
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, store=None):
+        super().__init__(store)
         self.session_duration = int(
             os.getenv("SESSION_DURATION")) if os.getenv("SESSION_DURATION") \
             else 0
@@ -71,9 +71,9 @@ class SessionExpAuth(SessionAuth):
         """
         if session_id is None:
             return None
-        if session_id not in self.user_id_by_session_id:
+        session_dict = self.user_id_by_session_id.get(session_id)
+        if session_dict is None:
             return None
-        session_dict = self.user_id_by_session_id[session_id]
         if self.session_duration <= 0:
             return session_dict.get("user_id")
         if "created_at" not in session_dict:
@@ -81,5 +81,6 @@ class SessionExpAuth(SessionAuth):
         expiration_time = session_dict["created_at"] + \
             timedelta(seconds=self.session_duration)
         if expiration_time < datetime.now():
+            self.user_id_by_session_id.pop(session_id, None)
             return None
         return session_dict.get("user_id")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+""" Sharded in-memory session store
+"""
+from collections import OrderedDict
+import os
+import threading
+
+_MISSING = object()
+
+
+class SessionStore():
+    """ Thread-safe mapping of session IDs to session data
+
+    Keys are spread over shards, each an LRU ordered dict behind its
+    own lock, so threads working on different sessions rarely wait on
+    each other. Every operation is O(1). When max_size is set, a shard
+    over its share of max_size evicts its least recently used session.
+    The interface is the subset of dict used by SessionAuth.
+    """
+
+    def __init__(self, shards: int = 16, max_size: int = 0):
+        """ Initialize an empty store, max_size 0 leaves it unbounded
+        """
+        self.max_size = max_size
+        self._shards = [OrderedDict() for _ in range(max(shards, 1))]
+        self._locks = [threading.Lock() for _ in self._shards]
+        self._evictions = [0] * len(self._shards)
+        self._shard_size = -(-max_size // len(self._shards))
+
+    def _shard(self, session_id) -> int:
+        """ Shard index of a session ID
+        """
+        return hash(session_id) % len(self._shards)
+
+    def __setitem__(self, session_id, value) -> None:
+        """ Store a session, evicting the least recently used if full
+        """
+        index = self._shard(session_id)
+        shard = self._shards[index]
+        with self._locks[index]:
+            shard[session_id] = value
+            shard.move_to_end(session_id)
+            if self._shard_size and len(shard) > self._shard_size:
+                shard.popitem(last=False)
+                self._evictions[index] += 1
+
+    def get(self, session_id, default=None):
+        """ Session value, marked as recently used, or default
+        """
+        index = self._shard(session_id)
+        shard = self._shards[index]
+        with self._locks[index]:
+            value = shard.get(session_id, _MISSING)
+            if value is _MISSING:
+                return default
+            shard.move_to_end(session_id)
+            return value
+
+    def __getitem__(self, session_id):
+        """ Session value, KeyError if missing
+        """
+        value = self.get(session_id, _MISSING)
+        if value is _MISSING:
+            raise KeyError(session_id)
+        return value
+
+    def pop(self, session_id, default=_MISSING):
+        """ Remove a session and return its value
+        """
+        index = self._shard(session_id)
+        with self._locks[index]:
+            value = self._shards[index].pop(session_id, default)
+        if value is _MISSING:
+            raise KeyError(session_id)
+        return value
+
+    def __delitem__(self, session_id) -> None:
+        """ Remove a session, KeyError if missing
+        """
+        self.pop(session_id)
+
+    def __contains__(self, session_id) -> bool:
+        """ True if the session is stored
+        """
+        return session_id in self._shards[self._shard(session_id)]
+
+    def __len__(self) -> int:
+        """ Number of stored sessions
+        """
+        return sum(len(shard) for shard in self._shards)
+
+    def clear(self) -> None:
+        """ Remove every session
+        """
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                shard.clear()
+
+    @property
+    def stats(self) -> dict:
+        """ Size and number of evicted sessions
+        """
+        return {"size": len(self), "evictions": sum(self._evictions),
+                "shards": len(self._shards)}
+
+
+def create_session_store() -> SessionStore:
+    """ Store configured by SESSION_STORE_SHARDS and
+    SESSION_STORE_MAX_SIZE (0 for unbounded)
+    """
+    return SessionStore(int(os.getenv("SESSION_STORE_SHARDS", 16)),
+                        int(os.getenv("SESSION_STORE_MAX_SIZE", 100000)))
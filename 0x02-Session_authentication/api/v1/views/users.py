@@ -1,19 +1,73 @@
 #!/usr/bin/env python3
 """ Module of Users views
 """
+from api.v1.auth.context import current_user
 from api.v1.views import app_views
-from flask import abort, jsonify, request
+from flask import Response, abort, jsonify, request, stream_with_context
 from models.user import User
+import json
+
+MAX_PAGE_SIZE = 1000
+
+
+def _json_array(users) -> str:
+    """ Generate a JSON array of users chunk by chunk
+    """
+    yield "["
+    separator = ""
+    for user in users:
+        yield separator + json.dumps(user.to_json())
+        separator = ","
+    yield "]\n"
+
+
+def _ndjson(users) -> str:
+    """ Generate one JSON document per line per user
+    """
+    for user in users:
+        yield json.dumps(user.to_json()) + "\n"
 
 
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
 def view_all_users() -> str:
     """ GET /api/v1/users
+    Query parameters:
+      - limit (optional): maximum number of users, at most 1000
+      - after (optional): ID of the last user of the previous page
+      - format (optional): json (default) or ndjson
     Return:
-      - list of all User objects JSON represented
+      - list of User objects JSON represented, ordered by ID and
+        streamed as they are read
+      - X-Next-After header with the cursor of the next page when
+        the page is full
+      - 400 if a parameter is invalid
     """
-    all_users = [user.to_json() for user in User.all()]
-    return jsonify(all_users)
+    limit = request.args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= MAX_PAGE_SIZE:
+            return jsonify({'error': "limit must be between 1 and {}".format(
+                MAX_PAGE_SIZE)}), 400
+    output = request.args.get('format', 'json')
+    if output not in ('json', 'ndjson'):
+        return jsonify({'error': "format must be json or ndjson"}), 400
+
+    users = User.iterate(request.args.get('after'), limit)
+    headers = {}
+    if limit is not None:
+        # A page is small and bounded: read it to know the next cursor
+        users = list(users)
+        if len(users) == limit:
+            headers['X-Next-After'] = users[-1].id
+    if output == 'ndjson':
+        body, mimetype = _ndjson(users), 'application/x-ndjson'
+    else:
+        body, mimetype = _json_array(users), 'application/json'
+    return Response(stream_with_context(body), mimetype=mimetype,
+                    headers=headers)
 
 
 @app_views.route('/users/me', methods=['GET'], strict_slashes=False)
@@ -23,9 +77,10 @@ def get_current_user() -> str:
       - Authenticated User object JSON represented
       - 404 if no user is authenticated
     """
-    if request.current_user is None:
+    user = current_user()
+    if user is None:
         abort(404)
-    return jsonify(request.current_user.to_json())
+    return jsonify(user.to_json())
 
 
 @app_views.route('/users/<user_id>', methods=['GET'], strict_slashes=False)
@@ -38,9 +93,10 @@ def view_one_user(user_id: str = None) -> str:
       - 404 if the User ID doesn't exist
     """
     if user_id == 'me':
-        if request.current_user is None:
+        user = current_user()
+        if user is None:
             abort(404)
-        return jsonify(request.current_user.to_json())
+        return jsonify(user.to_json())
 
     if user_id is None:
         abort(404)
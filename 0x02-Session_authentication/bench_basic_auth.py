@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+""" Benchmark of BasicAuth.current_user with repeated clients
+"""
+import base64
+import os
+import sys
+import tempfile
+import time
+
+from api.v1.auth import credential_cache
+from api.v1.auth.basic_auth import BasicAuth
+from models import base
+from models.user import User
+
+USERS = 100000
+CLIENTS = 100
+REQUESTS = 20000
+
+
+class FakeRequest():
+    """ Request carrying only an Authorization header
+    """
+
+    def __init__(self, authorization: str):
+        """ Initialize the headers
+        """
+        self.headers = {"Authorization": authorization}
+
+
+def build_requests(users: int, clients: int) -> list:
+    """ Store users users, return requests of clients of them
+    """
+    base.DATA["User"] = {}
+    User.invalidate_cache()
+    requests = []
+    for i in range(users):
+        user = User(email="user{}@example.com".format(i))
+        user.password = "pwd{}".format(i)
+        user.save()
+        if i % (users // clients) == 0:
+            credentials = "{}:{}".format(user.email, "pwd{}".format(i))
+            requests.append(FakeRequest("Basic " + base64.b64encode(
+                credentials.encode()).decode()))
+    return requests
+
+
+def requests_per_second(auth: BasicAuth, requests: list,
+                        count: int) -> float:
+    """ Authenticate count requests cycling through requests
+    """
+    start = time.perf_counter()
+    for i in range(count):
+        assert auth.current_user(requests[i % len(requests)]) is not None
+    return count / (time.perf_counter() - start)
+
+
+def run(users: int, clients: int, count: int) -> None:
+    """ Print req/s without and with the credential cache
+    """
+    os.chdir(tempfile.mkdtemp())
+    auth = BasicAuth()
+    cache = credential_cache.get_credential_cache()
+    requests = build_requests(users, clients)
+    print("{} users, {} clients, {} requests".format(users, clients, count))
+    cache.max_size = 0
+    print("uncached: {:10.1f} req/s".format(
+        requests_per_second(auth, requests, count)))
+    cache.max_size = 1024
+    print("cached:   {:10.1f} req/s".format(
+        requests_per_second(auth, requests, count)))
+    print(cache.stats)
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    run(*(args + [USERS, CLIENTS, REQUESTS][len(args):]))
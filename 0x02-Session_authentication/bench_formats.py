@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+""" Benchmark of the snapshot formats: file size, save and load time
+"""
+import os
+import sys
+import tempfile
+import time
+
+from models import base
+from models.formats import FORMATS
+from models.user import User
+
+RECORD_COUNTS = (100000,)
+
+
+def populate(count: int) -> None:
+    """ Fill DATA with count users
+    """
+    base.DATA["User"] = {}
+    for i in range(count):
+        user = User(email="user{}@example.com".format(i),
+                    first_name="First{}".format(i),
+                    last_name="Last{}".format(i))
+        user.password = "pwd{}".format(i)
+        base.DATA["User"][user.id] = user
+
+
+def timed(fn) -> float:
+    """ Seconds taken by fn()
+    """
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(counts) -> None:
+    """ Print size, save and load time of each format per store size
+    """
+    os.chdir(tempfile.mkdtemp())
+    print("{:>9} {:>7} {:>9} {:>9} {:>9}".format(
+        "records", "format", "MB", "save (s)", "load (s)"))
+    for count in counts:
+        populate(count)
+        for name, storage_format in FORMATS.items():
+            base.STORAGE_FORMAT = storage_format
+            save = timed(User.save_to_file)
+            size = os.path.getsize(User._snapshot_path()) / 1e6
+            load = timed(User.load_from_file)
+            assert User.count() == count
+            print("{:>9} {:>7} {:>9.1f} {:>9.2f} {:>9.2f}".format(
+                count, name, size, save, load))
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or RECORD_COUNTS)
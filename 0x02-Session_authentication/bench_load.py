@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+""" Startup benchmark of User.load_from_file
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from models import base
+from models.base import DATA, TIMESTAMP_FORMAT
+from models.user import User
+
+RECORD_COUNTS = (100000, 1000000)
+
+
+def build_store(count: int) -> None:
+    """ Write count users to .db_User.json
+    """
+    objs = {}
+    for i in range(count):
+        obj_id = str(uuid.uuid4())
+        objs[obj_id] = {"id": obj_id,
+                        "created_at": "2024-06-06T11:30:18",
+                        "updated_at": "2024-06-06T11:30:18",
+                        "email": "user{}@example.com".format(i),
+                        "_password": "{:064x}".format(i),
+                        "first_name": "First{}".format(i),
+                        "last_name": "Last{}".format(i)}
+    with open(".db_User.json", "w") as f:
+        json.dump(objs, f)
+
+
+def strptime_load() -> None:
+    """ Load the way load_from_file used to: json.load, then strptime
+    """
+    parse_timestamp = base.parse_timestamp
+    base.parse_timestamp = lambda value: datetime.strptime(
+        value, TIMESTAMP_FORMAT)
+    try:
+        DATA["User"] = {}
+        with open(".db_User.json", "r") as f:
+            for obj_id, obj_json in json.load(f).items():
+                DATA["User"][obj_id] = User(**obj_json)
+    finally:
+        base.parse_timestamp = parse_timestamp
+
+
+def timed(load) -> float:
+    """ Seconds taken by load()
+    """
+    start = time.perf_counter()
+    load()
+    return time.perf_counter() - start
+
+
+def run(counts) -> None:
+    """ Print load times of both loaders per store size
+    """
+    os.chdir(tempfile.mkdtemp())
+    print("{:>9} {:>9} {:>14} {:>14}".format(
+        "records", "MB", "strptime (s)", "streaming (s)"))
+    for count in counts:
+        build_store(count)
+        size = os.path.getsize(".db_User.json") / 1e6
+        before = timed(strptime_load)
+        after = timed(User.load_from_file)
+        assert User.count() == count
+        print("{:>9} {:>9.1f} {:>14.2f} {:>14.2f}".format(
+            count, size, before, after))
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or RECORD_COUNTS)
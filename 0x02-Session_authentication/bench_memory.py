@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+""" Memory benchmark of the model representation
+"""
+import gc
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime
+
+from models.user import User
+
+RECORDS = 100000
+
+
+class DictUser():
+    """ User laid out as before __slots__: every attribute in __dict__
+    """
+
+    def __init__(self, **kwargs):
+        """ Initialize from keyword attributes
+        """
+        self.__dict__.update(kwargs)
+
+
+def attributes(i: int) -> dict:
+    """ Attributes of the i-th synthetic user
+    """
+    now = datetime.utcnow()
+    return {"id": str(uuid.uuid4()), "created_at": now, "updated_at": now,
+            "email": "user{}@example.com".format(i),
+            "_password": "{:064x}".format(i),
+            "first_name": "First{}".format(i),
+            "last_name": "Last{}".format(i)}
+
+
+def bytes_per_record(build, count: int) -> float:
+    """ Traced bytes per object kept alive by build(i), minus the
+    attribute values shared by both layouts
+    """
+    values = [attributes(i) for i in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    objs = {i: build(values[i]) for i in range(count)}
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return size / count
+
+
+def build_user(values: dict) -> User:
+    """ Slotted User with the given attribute values
+    """
+    user = User()
+    for key, value in values.items():
+        setattr(user, key, value)
+    return user
+
+
+def run(count: int) -> None:
+    """ Print bytes per record of both layouts
+    """
+    before = bytes_per_record(lambda v: DictUser(**v), count)
+    after = bytes_per_record(build_user, count)
+    print("{} records".format(count))
+    print("__dict__ layout: {:8.1f} bytes/record".format(before))
+    print("__slots__ layout: {:7.1f} bytes/record".format(after))
+    print("saved: {:.1f}%".format(100 * (before - after) / before))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else RECORDS)
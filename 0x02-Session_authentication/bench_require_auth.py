@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+""" Benchmark of Auth.require_auth with a list and with a PathPolicy
+"""
+import random
+import sys
+import time
+
+from api.v1.auth.auth import Auth
+from api.v1.auth.path_policy import PathPolicy
+
+RULE_COUNTS = (10, 1000, 10000)
+LOOKUPS = 20000
+
+
+def build_rules(count: int) -> list:
+    """ count excluded paths, a quarter of them wildcards
+    """
+    rules = []
+    for i in range(count):
+        rule = "/api/v1/resource{}/".format(i)
+        rules.append(rule[:-1] + "*" if i % 4 == 0 else rule)
+    return rules
+
+
+def build_paths(rules: list, count: int) -> list:
+    """ count request paths, half of them excluded
+    """
+    paths = []
+    for i in range(count):
+        if i % 2:
+            paths.append("/api/v1/users/{}".format(i))
+        else:
+            paths.append(random.choice(rules).rstrip("*") + "item")
+    return paths
+
+
+def lookups_per_second(auth: Auth, paths: list, excluded_paths) -> float:
+    """ Time require_auth over every path
+    """
+    start = time.perf_counter()
+    for path in paths:
+        auth.require_auth(path, excluded_paths)
+    return len(paths) / (time.perf_counter() - start)
+
+
+def run(counts) -> None:
+    """ Print lookups per second for each rule count
+    """
+    auth = Auth()
+    print("{:>7} {:>14} {:>14}".format("rules", "list req/s", "policy req/s"))
+    for count in counts:
+        rules = build_rules(count)
+        paths = build_paths(rules, LOOKUPS)
+        policy = PathPolicy(rules)
+        scan_paths = paths[:max(LOOKUPS * 10 // count, 100)]
+        print("{:>7} {:>14.1f} {:>14.1f}".format(
+            count, lookups_per_second(auth, scan_paths, rules),
+            lookups_per_second(auth, paths, policy)))
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or RULE_COUNTS)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+""" Multi-threaded throughput of SessionAuth session stores
+"""
+import sys
+import threading
+import time
+import uuid
+
+from api.v1.auth.session_auth import SessionAuth
+from api.v1.auth.session_store import SessionStore
+
+THREADS = (1, 4, 16)
+OPERATIONS = 20000
+MAX_SIZE = 10000
+
+
+class LockedDict(dict):
+    """ dict behind a single lock, the simplest thread-safe store
+    """
+
+    def __init__(self):
+        """ Initialize the lock
+        """
+        super().__init__()
+        self._lock = threading.Lock()
+
+    def __setitem__(self, key, value):
+        """ Store under the lock
+        """
+        with self._lock:
+            super().__setitem__(key, value)
+
+    def get(self, key, default=None):
+        """ Read under the lock
+        """
+        with self._lock:
+            return super().get(key, default)
+
+    def pop(self, key, default=None):
+        """ Remove under the lock
+        """
+        with self._lock:
+            return super().pop(key, default)
+
+
+def worker(auth: SessionAuth, operations: int) -> None:
+    """ Create a session, look it up eight times, destroy it half
+    of the time
+    """
+    session_ids = [str(uuid.uuid4()) for _ in range(operations // 10)]
+    for i, session_id in enumerate(session_ids):
+        auth.user_id_by_session_id[session_id] = "user"
+        for _ in range(8):
+            auth.user_id_for_session_id(session_id)
+        if i % 2:
+            auth.user_id_by_session_id.pop(session_id, None)
+
+
+def ops_per_second(store, threads: int) -> float:
+    """ Run threads workers against store
+    """
+    auth = SessionAuth(store)
+    pool = [threading.Thread(target=worker, args=(auth, OPERATIONS))
+            for _ in range(threads)]
+    start = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return threads * OPERATIONS / (time.perf_counter() - start)
+
+
+def run(thread_counts) -> None:
+    """ Print operations per second for each store and thread count
+    """
+    print("{:>7} {:>14} {:>14} {:>14}".format(
+        "threads", "dict ops/s", "locked ops/s", "sharded ops/s"))
+    for threads in thread_counts:
+        sharded = SessionStore(16, MAX_SIZE)
+        print("{:>7} {:>14.1f} {:>14.1f} {:>14.1f}".format(
+            threads, ops_per_second({}, threads),
+            ops_per_second(LockedDict(), threads),
+            ops_per_second(sharded, threads)))
+        print("{:>7} sharded store {}".format("", sharded.stats))
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or THREADS)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+""" Benchmark of SessionDBAuth lookups against the stored session count
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+from api.v1.auth.session_db_auth import SessionDBAuth
+from models.user_session import UserSession
+
+SESSION_COUNTS = (10000, 100000, 1000000)
+LOOKUPS = 10000
+FULL_RELOAD_LOOKUPS = 3
+
+
+def build_store(count: int) -> str:
+    """ Write count sessions to .db_UserSession.json
+    Return one of the stored session IDs
+    """
+    objs = {}
+    session_id = None
+    for _ in range(count):
+        obj_id, session_id = str(uuid.uuid4()), str(uuid.uuid4())
+        objs[obj_id] = {"id": obj_id,
+                        "created_at": "2024-06-06T11:30:18",
+                        "updated_at": "2024-06-06T11:30:18",
+                        "user_id": str(uuid.uuid4()),
+                        "session_id": session_id}
+    with open(".db_UserSession.json", "w") as f:
+        json.dump(objs, f)
+    return session_id
+
+
+def full_reload_lookup(auth: SessionDBAuth, session_id: str) -> str:
+    """ Lookup the way SessionDBAuth used to: reload, then search
+    """
+    UserSession.load_from_file()
+    return UserSession.search({'session_id': session_id})[0].user_id
+
+
+def requests_per_second(lookup, count: int) -> float:
+    """ Time count calls of lookup()
+    """
+    start = time.perf_counter()
+    for _ in range(count):
+        lookup()
+    return count / (time.perf_counter() - start)
+
+
+def run(counts) -> None:
+    """ Print lookups per second with and without the cached store
+    """
+    os.chdir(tempfile.mkdtemp())
+    auth = SessionDBAuth()
+    print("{:>9} {:>14} {:>14}".format("sessions", "reload req/s",
+                                       "cached req/s"))
+    for count in counts:
+        session_id = build_store(count)
+        UserSession.invalidate_cache()
+        uncached = requests_per_second(
+            lambda: full_reload_lookup(auth, session_id),
+            FULL_RELOAD_LOOKUPS)
+        auth.user_id_for_session_id(session_id)
+        cached = requests_per_second(
+            lambda: auth.user_id_for_session_id(session_id), LOOKUPS)
+        print("{:>9} {:>14.1f} {:>14.1f}".format(count, uncached, cached))
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or SESSION_COUNTS)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+""" Benchmark of the app import time and first request latency
+
+The baseline builds the backend while the app is imported, the way
+the former AUTH_TYPE if/elif chain did; the lazy column is the
+registry as shipped, building it on the first request.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+AUTH_TYPES = ("basic_auth", "session_auth", "session_db_auth")
+RUNS = 10
+
+CHILD = """
+import sys
+import time
+start = time.perf_counter()
+from api.v1.app import app, auth
+if sys.argv[1] == "baseline":
+    auth.backend
+imported = time.perf_counter()
+app.test_client().get("/api/v1/users/me")
+print(imported - start, time.perf_counter() - imported)
+"""
+
+
+def measure(auth_type: str, mode: str) -> tuple:
+    """ Import time and first request latency of one fresh process
+    """
+    env = dict(os.environ, AUTH_TYPE=auth_type,
+               PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+    output = subprocess.run([sys.executable, "-c", CHILD, mode], env=env,
+                            cwd=tempfile.mkdtemp(), check=True,
+                            capture_output=True, text=True).stdout
+    return tuple(float(value) for value in output.split())
+
+
+def medians(auth_type: str, mode: str, runs: int) -> tuple:
+    """ Median import and first request times in milliseconds
+    """
+    samples = [measure(auth_type, mode) for _ in range(runs)]
+    return (statistics.median(s[0] for s in samples) * 1000,
+            statistics.median(s[1] for s in samples) * 1000)
+
+
+def run(auth_types, runs: int) -> None:
+    """ Print baseline and lazy times for each AUTH_TYPE
+    """
+    print("{:>16} {:>21} {:>21}".format("", "baseline (eager)",
+                                        "lazy registry"))
+    print("{:>16} {:>10} {:>10} {:>10} {:>10}".format(
+        "AUTH_TYPE", "import ms", "1st req ms", "import ms", "1st req ms"))
+    for auth_type in auth_types:
+        print("{:>16} {:>10.1f} {:>10.1f} {:>10.1f} {:>10.1f}".format(
+            auth_type, *medians(auth_type, "baseline", runs),
+            *medians(auth_type, "lazy", runs)))
+
+
+if __name__ == "__main__":
+    run(sys.argv[1:] or AUTH_TYPES, RUNS)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+""" Benchmark of the to_json cache on User.save_to_file
+Run with MODELS_CACHE_JSON=1 to measure the cache, without it to
+measure the uncached baseline
+"""
+import os
+import sys
+import tempfile
+import time
+
+from models import base
+from models.user import User
+
+RECORDS = 100000
+
+
+def populate(count: int) -> None:
+    """ Fill DATA with count users
+    """
+    base.DATA["User"] = {}
+    for i in range(count):
+        user = User(email="user{}@example.com".format(i),
+                    first_name="First{}".format(i),
+                    last_name="Last{}".format(i))
+        user.password = "pwd{}".format(i)
+        base.DATA["User"][user.id] = user
+
+
+def clear_caches() -> None:
+    """ Drop every cached JSON representation
+    """
+    for user in base.DATA["User"].values():
+        object.__setattr__(user, "_json_cache", None)
+
+
+def timed(fn) -> float:
+    """ Seconds taken by fn()
+    """
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def run(count: int) -> None:
+    """ Print save_to_file and to_json times with cold and warm caches
+    """
+    os.chdir(tempfile.mkdtemp())
+    populate(count)
+    users = list(base.DATA["User"].values())
+    print("{} users".format(count))
+    for name, fn in (("save_to_file", User.save_to_file),
+                     ("to_json", lambda: [u.to_json() for u in users])):
+        clear_caches()
+        cold = timed(fn)
+        warm = timed(fn)
+        print("{:>13}: cold {:6.2f}s  warm {:6.2f}s  ({:.1f}x)".format(
+            name, cold, warm, cold / warm))
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else RECORDS)
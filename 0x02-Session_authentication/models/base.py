@@ -1,21 +1,142 @@
 #!/usr/bin/env python3
 """ Base module
 """
+from contextlib import contextmanager
 from datetime import datetime
-from typing import TypeVar, List, Iterable
+from typing import Callable, TypeVar, List, Iterable, Iterator
+from models.formats import FORMATS, convert, get_format
 from os import path
+import atexit
+import bisect
 import json
+import os
+import threading
 import uuid
+try:
+    import fcntl
+except ImportError:
+    # No flock: the journal is only shared by the threads of a process
+    fcntl = None
 
 
 TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+# Snapshot format of this deployment, see models.formats
+STORAGE_FORMAT = get_format()
 DATA = {}
+INDEXES = {}
+# Journal entries appended since the last snapshot, per class
+JOURNAL_SIZES = {}
+JOURNAL_COMPACT_THRESHOLD = 1000
+JOURNAL_LOCK = threading.RLock()
+SNAPSHOT_LOCK = threading.Lock()
+COMPACTING = set()
+# Open flock'ed lock files: path -> [fd, depth]
+FILE_LOCKS = {}
+FILE_LOCKS_GUARD = threading.Lock()
+# Write-behind mode: journal lines buffered per class until flush()
+WRITE_BEHIND = {"enabled": False, "interval": 1.0, "max_pending": 100}
+PENDING = {}
+FLUSH_EVENT = threading.Event()
+# (mtime, size) of each class's files when DATA last matched them
+FILE_SIGNATURES = {}
+# Field plan of each model class: (name, is_private), base classes first
+FIELD_PLANS = {}
+# Cache to_json results per instance (MODELS_CACHE_JSON=1): faster
+# snapshots, but one more dict per object and slower attribute sets
+CACHE_JSON = os.getenv("MODELS_CACHE_JSON", "0") == "1"
+# IDs of each class in sorted order, for paginated iteration
+SORTED_IDS = {}
+ITERATION_PAGE_SIZE = 1000
+
+CHANGE_LISTENERS = []
+
+
+@contextmanager
+def file_lock(lock_path: str):
+    """ Re-entrant exclusive flock on lock_path, shared with the other
+    processes using the same files
+    Threads of this process are not told apart: callers hold
+    JOURNAL_LOCK or SNAPSHOT_LOCK to exclude each other
+    """
+    with FILE_LOCKS_GUARD:
+        state = FILE_LOCKS.setdefault(lock_path, [None, 0])
+        if state[1] == 0 and fcntl is not None:
+            state[0] = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            fcntl.flock(state[0], fcntl.LOCK_EX)
+        state[1] += 1
+    try:
+        yield
+    finally:
+        with FILE_LOCKS_GUARD:
+            state[1] -= 1
+            if state[1] == 0 and state[0] is not None:
+                fcntl.flock(state[0], fcntl.LOCK_UN)
+                os.close(state[0])
+                state[0] = None
+
+
+def parse_timestamp(value: str) -> datetime:
+    """ Parse a TIMESTAMP_FORMAT string
+    fromisoformat is a fixed-format C parser, much faster than strptime,
+    which is kept for strings it rejects (e.g. missing zero padding)
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, TIMESTAMP_FORMAT)
+
+
+class HashIndex():
+    """ Equality index of one attribute: value -> objects by ID
+    """
+
+    def __init__(self, attribute: str):
+        """ Initialize an empty index
+        """
+        self.attribute = attribute
+        self._buckets = {}
+        self._values = {}
+
+    def add(self, obj: TypeVar('Base')):
+        """ Index an object, replacing any previous entry for its ID
+        """
+        self.discard(obj.id)
+        value = getattr(obj, self.attribute, None)
+        try:
+            self._buckets.setdefault(value, {})[obj.id] = obj
+        except TypeError:
+            # Unhashable values are left to the linear scan
+            return
+        self._values[obj.id] = value
+
+    def discard(self, obj_id: str):
+        """ Remove an object from the index
+        """
+        if obj_id not in self._values:
+            return
+        value = self._values.pop(obj_id)
+        bucket = self._buckets[value]
+        del bucket[obj_id]
+        if len(bucket) == 0:
+            del self._buckets[value]
+
+    def lookup(self, value) -> dict:
+        """ Objects whose attribute equals value, by ID
+        Raise TypeError if value is unhashable
+        """
+        return self._buckets.get(value, {})
 
 
 class Base():
     """ Base class
     """
 
+    # Instances have no __dict__: subclasses must list their attributes
+    __slots__ = ('id', 'created_at', 'updated_at', '_json_cache')
+
+    # Attributes kept in a HashIndex so search() can skip the full scan
+    indexed_attributes = ()
+
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a Base instance
         """
@@ -25,13 +146,11 @@ class Base():
 
         self.id = kwargs.get('id', str(uuid.uuid4()))
         if kwargs.get('created_at') is not None:
-            self.created_at = datetime.strptime(kwargs.get('created_at'),
-                                                TIMESTAMP_FORMAT)
+            self.created_at = parse_timestamp(kwargs.get('created_at'))
         else:
             self.created_at = datetime.utcnow()
         if kwargs.get('updated_at') is not None:
-            self.updated_at = datetime.strptime(kwargs.get('updated_at'),
-                                                TIMESTAMP_FORMAT)
+            self.updated_at = parse_timestamp(kwargs.get('updated_at'))
         else:
             self.updated_at = datetime.utcnow()
 
@@ -44,69 +163,225 @@ class Base():
             return False
         return (self.id == other.id)
 
+    def _attributes(self) -> Iterable[tuple]:
+        """ (name, value, is_private) of every set attribute,
+        in declaration order
+        """
+        cls = type(self)
+        plan = FIELD_PLANS.get(cls)
+        if plan is None:
+            plan = FIELD_PLANS[cls] = tuple(
+                (name, name[0] == '_')
+                for klass in reversed(cls.__mro__)
+                for name in klass.__dict__.get('__slots__', ())
+                if name not in ('__dict__', '__weakref__', '_json_cache'))
+        for name, private in plan:
+            try:
+                yield name, getattr(self, name), private
+            except AttributeError:
+                continue
+        # Subclasses without __slots__ keep the rest in __dict__
+        for name, value in getattr(self, '__dict__', {}).items():
+            yield name, value, name[0] == '_'
+
     def to_json(self, for_serialization: bool = False) -> dict:
         """ Convert the object a JSON dictionary
         """
-        result = {}
-        for key, value in self.__dict__.items():
-            if not for_serialization and key[0] == '_':
-                continue
-            if type(value) is datetime:
-                result[key] = value.strftime(TIMESTAMP_FORMAT)
-            else:
+        cache = getattr(self, '_json_cache', None)
+        if cache is None:
+            result, public = {}, []
+            for key, value, private in self._attributes():
+                if type(value) is datetime:
+                    value = value.strftime(TIMESTAMP_FORMAT)
                 result[key] = value
-        return result
+                if not private:
+                    public.append(key)
+            cache = (result, public)
+            if CACHE_JSON:
+                object.__setattr__(self, '_json_cache', cache)
+        result, public = cache
+        if for_serialization:
+            return dict(result)
+        if len(public) == len(result):
+            return dict(result)
+        return {key: result[key] for key in public}
 
     @classmethod
     def load_from_file(cls):
         """ Load all objects from file
         """
+        STORAGE_ENGINE.load(cls)
+
+    @classmethod
+    def reload_if_changed(cls) -> bool:
+        """ Reload objects from file only if another writer changed it
+        since the last load or the cache was invalidated
+        Return True if objects were reloaded
+        """
+        return STORAGE_ENGINE.reload_if_changed(cls)
+
+    @classmethod
+    def _snapshot_path(cls) -> str:
+        """ Snapshot file of the class in the configured format
+        """
+        return ".db_{}.{}".format(cls.__name__, STORAGE_FORMAT.extension)
+
+    @classmethod
+    def _file_signature(cls) -> tuple:
+        """ (mtime, size) of the snapshot and journal files
+        """
+        file_path = cls._snapshot_path()
+        journal_path = ".db_{}.journal".format(cls.__name__)
+        signature = []
+        for f_path in (file_path, journal_path, journal_path + ".compacting"):
+            try:
+                st = os.stat(f_path)
+                signature.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    @classmethod
+    def _lock_path(cls, kind: str = "journal") -> str:
+        """ Lock file serializing journal or compact operations of the
+        class across processes
+        """
+        return ".db_{}.{}.lock".format(cls.__name__, kind)
+
+    @classmethod
+    def invalidate_cache(cls):
+        """ Force the next reload_if_changed to reload from file,
+        e.g. on a change notification from another process
+        """
+        with JOURNAL_LOCK:
+            FILE_SIGNATURES.pop(cls.__name__, None)
+
+    @staticmethod
+    def _replay_journal(journal_path: str, objs_json: dict) -> int:
+        """ Apply journal entries to serialized objects by ID,
+        deleted objects are set to None
+        Return the number of entries applied
+        """
+        if not path.exists(journal_path):
+            return 0
+        count = 0
+        with open(journal_path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn write at crash time: appends made since
+                    # start on a line of their own, so only this entry
+                    # is lost
+                    continue
+                if entry["op"] == "upsert":
+                    objs_json[entry["id"]] = entry["obj"]
+                else:
+                    objs_json[entry["id"]] = None
+                count += 1
+        return count
+
+    @classmethod
+    def _append_journal(cls, op: str, obj_id: str, obj_json: dict = None):
+        """ Append an upsert or delete to the class journal, or buffer
+        it in write-behind mode
+        """
+        entry = {"op": op, "id": obj_id}
+        if obj_json is not None:
+            entry["obj"] = obj_json
+        line = json.dumps(entry) + "\n"
+        with JOURNAL_LOCK:
+            if WRITE_BEHIND["enabled"]:
+                PENDING.setdefault(cls, []).append(line)
+                if sum(map(len, PENDING.values())) >= \
+                        WRITE_BEHIND["max_pending"]:
+                    FLUSH_EVENT.set()
+                return
+            cls._write_journal([line])
+
+    @classmethod
+    def _write_journal(cls, lines: List[str]):
+        """ Append lines to the class journal in one fsync'ed write
+        Start a background compaction once the journal is long enough
+        Caller holds JOURNAL_LOCK; the journal flock keeps the writes of
+        other processes and their compactions out
+        """
         s_class = cls.__name__
-        file_path = ".db_{}.json".format(s_class)
-        DATA[s_class] = {}
-        if not path.exists(file_path):
+        with JOURNAL_LOCK, file_lock(cls._lock_path()):
+            in_sync = FILE_SIGNATURES.get(s_class) == cls._file_signature()
+            with open(".db_{}.journal".format(s_class), 'ab+') as f:
+                data = "".join(lines).encode()
+                size = f.seek(0, os.SEEK_END)
+                if size:
+                    f.seek(size - 1)
+                    if f.read(1) != b"\n":
+                        # Never glue an entry onto a torn line
+                        data = b"\n" + data
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            if in_sync:
+                # Our own write: DATA already holds it, no reload needed
+                FILE_SIGNATURES[s_class] = cls._file_signature()
+        JOURNAL_SIZES[s_class] = JOURNAL_SIZES.get(s_class, 0) + len(lines)
+        if JOURNAL_SIZES[s_class] < JOURNAL_COMPACT_THRESHOLD or \
+                s_class in COMPACTING:
             return
+        COMPACTING.add(s_class)
+        threading.Thread(target=cls._compact, daemon=True).start()
+
+    @classmethod
+    def _compact(cls):
+        """ Fold the journal into the snapshot file
+        """
+        try:
+            cls.save_to_file()
+        finally:
+            with JOURNAL_LOCK:
+                COMPACTING.discard(cls.__name__)
 
-        with open(file_path, 'r') as f:
-            objs_json = json.load(f)
-            for obj_id, obj_json in objs_json.items():
-                DATA[s_class][obj_id] = cls(**obj_json)
+    @classmethod
+    def _reset_indexes(cls):
+        """ Create empty indexes for the declared attributes
+        """
+        INDEXES[cls.__name__] = {attribute: HashIndex(attribute)
+                                 for attribute in cls.indexed_attributes}
+
+    @classmethod
+    def _index(cls, obj: TypeVar('Base')):
+        """ Add or refresh an object in all indexes of its class
+        """
+        if INDEXES.get(cls.__name__) is None:
+            cls._reset_indexes()
+        for index in INDEXES[cls.__name__].values():
+            index.add(obj)
 
     @classmethod
     def save_to_file(cls):
         """ Save all objects to file
         """
-        s_class = cls.__name__
-        file_path = ".db_{}.json".format(s_class)
-        objs_json = {}
-        for obj_id, obj in DATA[s_class].items():
-            objs_json[obj_id] = obj.to_json(True)
-
-        with open(file_path, 'w') as f:
-            json.dump(objs_json, f)
+        STORAGE_ENGINE.save_all(cls)
 
     def save(self):
         """ Save current object
         """
-        s_class = self.__class__.__name__
         self.updated_at = datetime.utcnow()
-        DATA[s_class][self.id] = self
-        self.__class__.save_to_file()
+        STORAGE_ENGINE.save(self)
+        for listener in CHANGE_LISTENERS:
+            listener(self, False)
 
     def remove(self):
         """ Remove object
         """
-        s_class = self.__class__.__name__
-        if DATA[s_class].get(self.id) is not None:
-            del DATA[s_class][self.id]
-            self.__class__.save_to_file()
+        STORAGE_ENGINE.remove(self)
+        for listener in CHANGE_LISTENERS:
+            listener(self, True)
 
     @classmethod
     def count(cls) -> int:
         """ Count all objects
         """
-        s_class = cls.__name__
-        return len(DATA[s_class].keys())
+        return STORAGE_ENGINE.count(cls)
 
     @classmethod
     def all(cls) -> Iterable[TypeVar('Base')]:
@@ -114,18 +389,251 @@ class Base():
         """
         return cls.search()
 
+    @classmethod
+    def iterate(cls, after: str = None,
+                limit: int = None) -> Iterator[TypeVar('Base')]:
+        """ Lazily yield objects in ID order, starting after the given ID
+        and stopping after limit objects if set
+        """
+        return STORAGE_ENGINE.iterate(cls, after, limit)
+
     @classmethod
     def get(cls, id: str) -> TypeVar('Base'):
         """ Return one object by ID
         """
-        s_class = cls.__name__
-        return DATA[s_class].get(id)
+        return STORAGE_ENGINE.get(cls, id)
 
     @classmethod
     def search(cls, attributes: dict = {}) -> List[TypeVar('Base')]:
         """ Search all objects with matching attributes
         """
+        return STORAGE_ENGINE.search(cls, attributes)
+
+
+def _setattr_invalidating(self, name: str, value):
+    """ Set an attribute and drop the cached JSON representation
+    """
+    object.__setattr__(self, name, value)
+    object.__setattr__(self, '_json_cache', None)
+
+
+if CACHE_JSON:
+    # Only objects of cache-enabled deployments pay for the hook
+    Base.__setattr__ = _setattr_invalidating
+
+
+class MemoryEngine():
+    """ Default storage engine: objects live in DATA and are persisted
+    to a snapshot file plus an append-only journal per class
+    """
+
+    def load(self, cls: type):
+        """ Load all objects of cls from its snapshot and journal
+        """
+        s_class = cls.__name__
+        file_path = cls._snapshot_path()
+        journal_path = ".db_{}.journal".format(s_class)
+        # save_all swaps the snapshot and drops the compacted journal
+        # under the journal locks, so the files read here are consistent
+        with JOURNAL_LOCK, file_lock(cls._lock_path()):
+            # Buffered write-behind changes must not be lost on reload
+            if PENDING.get(cls):
+                cls._write_journal(PENDING.pop(cls))
+            if not path.exists(file_path):
+                self._convert_snapshot(cls)
+            FILE_SIGNATURES[s_class] = cls._file_signature()
+            objs = {}
+            if path.exists(file_path):
+                # Stream the snapshot: objects are built as they are read
+                with open(file_path, 'rb') as f:
+                    for obj_id, obj_json in STORAGE_FORMAT.load(f):
+                        objs[obj_id] = cls(**obj_json)
+            changes = {}
+            replayed = 0
+            for j_path in (journal_path + ".compacting", journal_path):
+                replayed += cls._replay_journal(j_path, changes)
+            JOURNAL_SIZES[s_class] = replayed
+
+            for obj_id, obj_json in changes.items():
+                if obj_json is None:
+                    objs.pop(obj_id, None)
+                else:
+                    objs[obj_id] = cls(**obj_json)
+            DATA[s_class] = objs
+            SORTED_IDS.pop(s_class, None)
+            cls._reset_indexes()
+            for obj in objs.values():
+                cls._index(obj)
+
+    def _convert_snapshot(self, cls: type) -> None:
+        """ Convert the most recent snapshot of cls in another format to
+        the configured one, so the journal is replayed on the snapshot
+        it was written against after MODELS_STORAGE_FORMAT changes
+        The old snapshot is kept with an .old suffix
+        """
+        file_path = cls._snapshot_path()
+        others = [".db_{}.{}".format(cls.__name__, f.extension)
+                  for f in FORMATS.values() if f is not STORAGE_FORMAT]
+        others = [o_path for o_path in others if path.exists(o_path)]
+        if not others:
+            return
+        src_path = max(others, key=path.getmtime)
+        tmp_path = ".db_{}.converting.{}".format(cls.__name__,
+                                                 STORAGE_FORMAT.extension)
+        convert(src_path, tmp_path)
+        os.replace(tmp_path, file_path)
+        os.replace(src_path, src_path + ".old")
+
+    def reload_if_changed(self, cls: type) -> bool:
+        """ Reload cls only if its files changed since the last load
+        """
+        with JOURNAL_LOCK:
+            if cls.__name__ in DATA and \
+                    FILE_SIGNATURES.get(cls.__name__) == cls._file_signature():
+                return False
+        cls.load_from_file()
+        return True
+
+    def save_all(self, cls: type):
+        """ Write all objects of cls to a new snapshot file
+        """
         s_class = cls.__name__
+        file_path = cls._snapshot_path()
+        journal_path = ".db_{}.journal".format(s_class)
+        pending_path = journal_path + ".compacting"
+        # One compaction at a time, in this process and across processes
+        with SNAPSHOT_LOCK, file_lock(cls._lock_path("compact")):
+            with JOURNAL_LOCK, file_lock(cls._lock_path()):
+                signature = cls._file_signature()
+                # Files never loaded count as in sync only if missing
+                if FILE_SIGNATURES.get(s_class, (None,) * 3) != signature:
+                    # Another process wrote to the files: the snapshot
+                    # must hold its entries, not only this process's DATA
+                    self.load(cls)
+                # Entries written from now on go to a fresh journal; the
+                # pending one is only dropped once the snapshot covers it
+                if path.exists(journal_path):
+                    if path.exists(pending_path):
+                        with open(journal_path, 'r') as src, \
+                                open(pending_path, 'a') as dst:
+                            dst.write(src.read())
+                        os.remove(journal_path)
+                    else:
+                        os.replace(journal_path, pending_path)
+                # Our own rename: DATA still matches the files
+                FILE_SIGNATURES[s_class] = cls._file_signature()
+                JOURNAL_SIZES[s_class] = 0
+                # The snapshot covers buffered changes too
+                PENDING.pop(cls, None)
+                objs_json = {}
+                for obj_id, obj in list(DATA[s_class].items()):
+                    objs_json[obj_id] = obj.to_json(True)
+
+            tmp_path = file_path + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                STORAGE_FORMAT.dump(objs_json, f)
+                f.flush()
+                os.fsync(f.fileno())
+            with JOURNAL_LOCK, file_lock(cls._lock_path()):
+                in_sync = FILE_SIGNATURES.get(s_class) == \
+                    cls._file_signature()
+                os.replace(tmp_path, file_path)
+                if path.exists(pending_path):
+                    os.remove(pending_path)
+                if in_sync:
+                    # Stale DATA must still be reloaded, not blessed
+                    FILE_SIGNATURES[s_class] = cls._file_signature()
+
+    def save(self, obj: Base):
+        """ Store an object and journal it
+        """
+        cls = obj.__class__
+        obj_json = obj.to_json(True)
+        # Under JOURNAL_LOCK so a concurrent load or compaction sees
+        # DATA and the journal agree
+        with JOURNAL_LOCK:
+            ids = SORTED_IDS.get(cls.__name__)
+            if ids is not None and obj.id not in DATA[cls.__name__]:
+                bisect.insort(ids, obj.id)
+            DATA[cls.__name__][obj.id] = obj
+            cls._index(obj)
+            cls._append_journal("upsert", obj.id, obj_json)
+
+    def remove(self, obj: Base):
+        """ Drop an object and journal its deletion
+        """
+        s_class = obj.__class__.__name__
+        with JOURNAL_LOCK:
+            if DATA[s_class].get(obj.id) is None:
+                return
+            del DATA[s_class][obj.id]
+            ids = SORTED_IDS.get(s_class)
+            if ids is not None:
+                i = bisect.bisect_left(ids, obj.id)
+                if i < len(ids) and ids[i] == obj.id:
+                    del ids[i]
+            for index in INDEXES.get(s_class, {}).values():
+                index.discard(obj.id)
+            obj.__class__._append_journal("delete", obj.id)
+
+    def count(self, cls: type) -> int:
+        """ Number of objects of cls
+        """
+        return len(DATA[cls.__name__].keys())
+
+    def get(self, cls: type, id: str) -> Base:
+        """ Object of cls by ID, None if missing
+        """
+        return DATA[cls.__name__].get(id)
+
+    def _sorted_ids(self, s_class: str) -> List[str]:
+        """ Sorted IDs of a class, rebuilt if out of step with DATA
+        """
+        ids = SORTED_IDS.get(s_class)
+        if ids is None or len(ids) != len(DATA[s_class]):
+            ids = SORTED_IDS[s_class] = sorted(DATA[s_class])
+        return ids
+
+    def iterate(self, cls: type, after: str = None,
+                limit: int = None) -> Iterator[Base]:
+        """ Objects of cls in ID order after the given ID
+        IDs are copied one page at a time, never the whole class
+        """
+        s_class = cls.__name__
+        remaining = limit
+        while remaining is None or remaining > 0:
+            ids = self._sorted_ids(s_class)
+            start = 0 if after is None else bisect.bisect_right(ids, after)
+            page = ids[start:start + ITERATION_PAGE_SIZE]
+            if len(page) == 0:
+                return
+            for obj_id in page:
+                after = obj_id
+                obj = DATA[s_class].get(obj_id)
+                if obj is None:
+                    continue
+                yield obj
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining == 0:
+                        return
+
+    def search(self, cls: type, attributes: dict) -> List[Base]:
+        """ Objects of cls matching all attributes, using hash indexes
+        """
+        s_class = cls.__name__
+        objs = DATA[s_class]
+        indexes = INDEXES.get(s_class, {})
+        for k, v in attributes.items():
+            if k not in indexes:
+                continue
+            try:
+                candidates = indexes[k].lookup(v)
+            except TypeError:
+                continue
+            if len(candidates) < len(objs):
+                objs = candidates
+
         def _search(obj):
             if len(attributes) == 0:
                 return True
@@ -133,5 +641,73 @@ class Base():
                 if (getattr(obj, k) != v):
                     return False
             return True
-        
-        return list(filter(_search, DATA[s_class].values()))
+
+        return list(filter(_search, objs.values()))
+
+
+def get_engine(name: str = None):
+    """ Storage engine by name, MODELS_STORAGE_ENGINE by default:
+    memory (the default) or sqlite
+    """
+    name = name or os.getenv("MODELS_STORAGE_ENGINE", "memory")
+    if name == "memory":
+        return MemoryEngine()
+    if name == "sqlite":
+        from models.sqlite_engine import SQLiteEngine
+        return SQLiteEngine(os.getenv("MODELS_SQLITE_PATH", ".db.sqlite3"))
+    raise ValueError("Unknown storage engine: {}".format(name))
+
+
+STORAGE_ENGINE = get_engine()
+
+
+def add_change_listener(listener: Callable) -> Callable:
+    """ Call listener(obj, removed) after every save() and remove()
+    """
+    if listener not in CHANGE_LISTENERS:
+        CHANGE_LISTENERS.append(listener)
+    return listener
+
+
+def flush():
+    """ Write every buffered write-behind change to its journal
+    """
+    with JOURNAL_LOCK:
+        batches = list(PENDING.items())
+        PENDING.clear()
+        for cls, lines in batches:
+            cls._write_journal(lines)
+
+
+def _flush_loop():
+    """ Background flusher of the write-behind mode
+    """
+    while WRITE_BEHIND["enabled"]:
+        FLUSH_EVENT.wait(WRITE_BEHIND["interval"])
+        FLUSH_EVENT.clear()
+        flush()
+
+
+def enable_write_behind(interval: float = 1.0, max_pending: int = 100):
+    """ Buffer save() and remove() writes and flush them in batches
+    every interval seconds or once max_pending changes are buffered
+    """
+    with JOURNAL_LOCK:
+        WRITE_BEHIND["interval"] = interval
+        WRITE_BEHIND["max_pending"] = max_pending
+        if WRITE_BEHIND["enabled"]:
+            return
+        WRITE_BEHIND["enabled"] = True
+    threading.Thread(target=_flush_loop, daemon=True).start()
+
+
+def disable_write_behind():
+    """ Flush buffered changes and go back to synchronous writes
+    """
+    with JOURNAL_LOCK:
+        WRITE_BEHIND["enabled"] = False
+        FLUSH_EVENT.set()
+        flush()
+
+
+atexit.register(flush)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+""" Snapshot formats of the file-backed model store
+"""
+from typing import BinaryIO, Iterable, Iterator, Tuple
+import io
+import json
+import os
+import re
+import struct
+import sys
+
+
+JSON_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+
+
+def iter_json_object(f, chunk_size: int = JSON_CHUNK_SIZE) -> Iterable:
+    """ Yield (key, value) pairs of the top-level JSON object in file f,
+    reading chunk_size characters at a time instead of the whole file
+    """
+    buf, pos, eof = "", 0, False
+
+    def refill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf, pos = buf[pos:] + chunk, 0
+        return True
+
+    def skip_whitespace() -> bool:
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos < len(buf) or not refill():
+                return pos < len(buf)
+
+    def expect(chars: str) -> str:
+        nonlocal pos
+        if not skip_whitespace():
+            raise ValueError("Unexpected end of JSON file")
+        char = buf[pos]
+        if char not in chars:
+            raise ValueError("Expecting {!r}, got {!r}".format(chars, char))
+        pos += 1
+        return char
+
+    def decode():
+        nonlocal pos
+        if not skip_whitespace():
+            raise ValueError("Unexpected end of JSON file")
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(buf, pos)
+                # A value ending the buffer may be cut, e.g. a number
+                if end < len(buf) or eof:
+                    pos = end
+                    return value
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            refill()
+
+    expect("{")
+    if not skip_whitespace():
+        raise ValueError("Unexpected end of JSON file")
+    if buf[pos] == "}":
+        return
+    while True:
+        key = decode()
+        expect(":")
+        yield key, decode()
+        if expect(",}") == "}":
+            return
+
+
+class JsonFormat():
+    """ One JSON object mapping IDs to serialized objects
+    """
+
+    name = "json"
+    extension = "json"
+
+    def dump(self, objs_json: dict, f: BinaryIO):
+        """ Write serialized objects by ID to a binary file
+        """
+        text = io.TextIOWrapper(f, encoding="utf-8")
+        json.dump(objs_json, text)
+        text.detach()
+
+    def load(self, f: BinaryIO) -> Iterator[Tuple[str, dict]]:
+        """ Yield (ID, serialized object) pairs, streaming the file
+        """
+        yield from iter_json_object(io.TextIOWrapper(f, encoding="utf-8"))
+
+
+class BinaryFormat():
+    """ Length-prefixed frames after a magic header
+
+    Each frame is a type byte and a 4-byte big-endian payload length:
+    - S: JSON list of attribute names, the next schema number
+    - R: 2-byte schema number, then JSON list of ID and values
+    Attribute names are stored once per schema instead of per object,
+    and frames can be skipped or streamed without parsing them.
+    """
+
+    name = "binary"
+    extension = "bin"
+    MAGIC = b"HBDB\x01"
+    FRAME = struct.Struct(">cI")
+    SCHEMA = struct.Struct(">H")
+    BATCH_SIZE = 1024
+
+    def dump(self, objs_json: dict, f: BinaryIO):
+        """ Write serialized objects by ID to a binary file
+        """
+        f.write(self.MAGIC)
+        schemas = {}
+        frame = self.FRAME.pack
+        for obj_id, obj_json in objs_json.items():
+            keys = tuple(obj_json)
+            schema = schemas.get(keys)
+            if schema is None:
+                schema = schemas[keys] = len(schemas)
+                payload = json.dumps(keys).encode()
+                f.write(frame(b"S", len(payload)) + payload)
+            payload = self.SCHEMA.pack(schema) + json.dumps(
+                [obj_id, *obj_json.values()]).encode()
+            f.write(frame(b"R", len(payload)) + payload)
+
+    def load(self, f: BinaryIO) -> Iterator[Tuple[str, dict]]:
+        """ Yield (ID, serialized object) pairs, streaming the file
+        Record payloads are decoded BATCH_SIZE at a time with one
+        json.loads call, which is much cheaper than one call each
+        """
+        if f.read(len(self.MAGIC)) != self.MAGIC:
+            raise ValueError("Not a binary snapshot file")
+        schemas = []
+        batch = []
+        read = f.read
+        unpack = self.FRAME.unpack
+        while True:
+            header = read(self.FRAME.size)
+            if not header or len(batch) == self.BATCH_SIZE:
+                yield from self._decode(batch, schemas)
+                batch = []
+            if not header:
+                return
+            if len(header) < self.FRAME.size:
+                raise ValueError("Truncated binary snapshot file")
+            kind, length = unpack(header)
+            payload = read(length)
+            if len(payload) < length:
+                raise ValueError("Truncated binary snapshot file")
+            if kind == b"S":
+                schemas.append(json.loads(payload))
+            elif kind == b"R":
+                batch.append(payload)
+            else:
+                raise ValueError("Unknown frame type {!r}".format(kind))
+
+    def _decode(self, batch: list, schemas: list) -> Iterator[tuple]:
+        """ Decode a batch of record payloads
+        """
+        if not batch:
+            return
+        size = self.SCHEMA.size
+        rows = json.loads(b"[" + b",".join(p[size:] for p in batch) + b"]")
+        unpack = self.SCHEMA.unpack_from
+        for payload, values in zip(batch, rows):
+            keys = schemas[unpack(payload)[0]]
+            yield values[0], dict(zip(keys, values[1:]))
+
+
+FORMATS = {
+    JsonFormat.name: JsonFormat(),
+    BinaryFormat.name: BinaryFormat(),
+}
+
+
+def get_format(name: str = None):
+    """ Snapshot format by name, MODELS_STORAGE_FORMAT by default
+    """
+    name = name or os.getenv("MODELS_STORAGE_FORMAT", "json")
+    if name not in FORMATS:
+        raise ValueError("Unknown storage format: {}".format(name))
+    return FORMATS[name]
+
+
+def format_for_path(file_path: str):
+    """ Snapshot format matching the extension of file_path
+    """
+    extension = os.path.splitext(file_path)[1][1:]
+    for storage_format in FORMATS.values():
+        if storage_format.extension == extension:
+            return storage_format
+    raise ValueError("Unknown storage format for {}".format(file_path))
+
+
+def convert(src_path: str, dst_path: str) -> int:
+    """ Convert a snapshot file between formats by extension,
+    e.g. .db_User.json to .db_User.bin
+    Return the number of objects converted
+    """
+    with open(src_path, "rb") as f:
+        objs_json = dict(format_for_path(src_path).load(f))
+    with open(dst_path, "wb") as f:
+        format_for_path(dst_path).dump(objs_json, f)
+    return len(objs_json)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python3 -m models.formats SRC DST")
+    print("{} objects converted".format(convert(sys.argv[1], sys.argv[2])))
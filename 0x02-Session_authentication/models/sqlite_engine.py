@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+""" SQLite storage engine
+"""
+from datetime import datetime
+from typing import Iterator, List
+import json
+import sqlite3
+import threading
+
+
+class SQLiteEngine():
+    """ Storage engine keeping each model class in a SQLite table
+
+    Rows hold the serialized object as JSON, plus one indexed column
+    per indexed_attributes entry. The database runs in WAL mode so
+    several worker processes can read while one writes, and every
+    thread gets its own connection. SQL strings are fixed per class so
+    sqlite3's statement cache reuses the prepared statements.
+    """
+
+    def __init__(self, db_path: str):
+        """ Initialize the engine on a database file
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        self._statements = {}
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        """ Connection of the current thread, opened on first use
+        """
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.db_path, timeout=5.0, isolation_level=None,
+                cached_statements=256)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _sql(self, cls: type) -> dict:
+        """ Create the table of cls if needed, return its statements
+        """
+        statements = self._statements.get(cls)
+        if statements is not None:
+            return statements
+        with self._lock:
+            table = cls.__name__
+            columns = list(cls.indexed_attributes)
+            connection = self._connection()
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS "{}" ('
+                'id TEXT PRIMARY KEY, data TEXT NOT NULL{})'.format(
+                    table, "".join(', "{}"'.format(c) for c in columns)))
+            for column in columns:
+                connection.execute(
+                    'CREATE INDEX IF NOT EXISTS "{0}_{1}" '
+                    'ON "{0}" ("{1}")'.format(table, column))
+            names = ", ".join(['id', 'data'] +
+                              ['"{}"'.format(c) for c in columns])
+            updates = ", ".join('{0} = excluded.{0}'.format(name)
+                                for name in names.split(", ")[1:])
+            statements = {
+                "columns": columns,
+                # Upsert keeps the rowid, so rowid order is creation order
+                "save": 'INSERT INTO "{}" ({}) VALUES ({}) '
+                        'ON CONFLICT(id) DO UPDATE SET {}'.format(
+                            table, names,
+                            ", ".join("?" * (len(columns) + 2)), updates),
+                "remove": 'DELETE FROM "{}" WHERE id = ?'.format(table),
+                "get": 'SELECT data FROM "{}" WHERE id = ?'.format(table),
+                "count": 'SELECT COUNT(*) FROM "{}"'.format(table),
+                "select": 'SELECT data FROM "{}"'.format(table),
+                "page": 'SELECT id, data FROM "{}" WHERE id > ? '
+                        'ORDER BY id LIMIT ?'.format(table),
+            }
+            self._statements[cls] = statements
+        return statements
+
+    def load(self, cls: type):
+        """ Make sure the table of cls exists; rows are read on demand
+        """
+        self._sql(cls)
+
+    def reload_if_changed(self, cls: type) -> bool:
+        """ Queries always read the database, nothing to reload
+        """
+        self._sql(cls)
+        return False
+
+    def save_all(self, cls: type):
+        """ Checkpoint the WAL into the main database file
+        """
+        self._sql(cls)
+        self._connection().execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def save(self, obj):
+        """ Insert or update an object
+        """
+        sql = self._sql(obj.__class__)
+        obj_json = obj.to_json(True)
+        self._connection().execute(
+            sql["save"],
+            [obj.id, json.dumps(obj_json)] +
+            [obj_json.get(column) for column in sql["columns"]])
+
+    def remove(self, obj):
+        """ Delete an object
+        """
+        self._connection().execute(self._sql(obj.__class__)["remove"],
+                                   (obj.id,))
+
+    def count(self, cls: type) -> int:
+        """ Number of objects of cls
+        """
+        return self._connection().execute(
+            self._sql(cls)["count"]).fetchone()[0]
+
+    def get(self, cls: type, id: str):
+        """ Object of cls by ID, None if missing
+        """
+        row = self._connection().execute(
+            self._sql(cls)["get"], (id,)).fetchone()
+        return None if row is None else cls(**json.loads(row[0]))
+
+    def iterate(self, cls: type, after: str = None,
+                limit: int = None) -> Iterator:
+        """ Objects of cls in ID order after the given ID, read one
+        page at a time through the primary key index
+        """
+        from models.base import ITERATION_PAGE_SIZE
+
+        sql = self._sql(cls)["page"]
+        after = "" if after is None else after
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = ITERATION_PAGE_SIZE if remaining is None \
+                else min(remaining, ITERATION_PAGE_SIZE)
+            rows = self._connection().execute(sql, (after, size)).fetchall()
+            for after, data in rows:
+                yield cls(**json.loads(data))
+            if len(rows) < size:
+                return
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def search(self, cls: type, attributes: dict) -> List:
+        """ Objects of cls matching all attributes, in creation order
+        Indexed attributes are matched on their column, others on
+        the stored JSON
+        """
+        from models.base import TIMESTAMP_FORMAT
+
+        sql = self._sql(cls)
+        clauses, params = [], []
+        for k, v in attributes.items():
+            if type(v) is datetime:
+                v = v.strftime(TIMESTAMP_FORMAT)
+            if k == "id" or k in sql["columns"]:
+                clauses.append('"{}" IS ?'.format(k))
+                params.append(v)
+            else:
+                clauses.append("json_extract(data, ?) IS ?")
+                params.extend(['$."{}"'.format(k), v])
+        query = sql["select"]
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        rows = self._connection().execute(query + " ORDER BY rowid", params)
+        return [cls(**json.loads(data)) for data, in rows]
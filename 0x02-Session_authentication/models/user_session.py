@@ -6,6 +6,9 @@ from models.base import Base
 class UserSession(Base):
     """ UserSession model to store session ID and user ID """
 
+    __slots__ = ('user_id', 'session_id')
+    indexed_attributes = ('session_id',)
+
     def __init__(self, *args: list, **kwargs: dict):
         """ Initialize a UserSession instance """
         super().__init__(*args, **kwargs)
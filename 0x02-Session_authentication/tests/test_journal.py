@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+""" Regression tests of the snapshot + journal storage
+"""
+from unittest import mock
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+from models import base
+from models.formats import FORMATS
+from models.user import User
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@unittest.skipUnless(isinstance(base.STORAGE_ENGINE, base.MemoryEngine),
+                     "journal tests need the memory engine")
+class TestJournal(unittest.TestCase):
+    """ Journal, compaction and reload behaviour of MemoryEngine
+    """
+
+    def setUp(self):
+        """ Run each test in an empty directory with fresh state
+        """
+        self.cwd = os.getcwd()
+        os.chdir(tempfile.mkdtemp())
+        for state in (base.DATA, base.INDEXES, base.FILE_SIGNATURES,
+                      base.JOURNAL_SIZES, base.SORTED_IDS, base.PENDING):
+            state.clear()
+        User.load_from_file()
+
+    def tearDown(self):
+        """ Go back to the original directory
+        """
+        os.chdir(self.cwd)
+
+    def restart(self):
+        """ Forget the in-memory state and load from the files
+        """
+        base.DATA.clear()
+        base.FILE_SIGNATURES.clear()
+        User.load_from_file()
+
+    def emails(self) -> list:
+        """ Sorted emails of the loaded users
+        """
+        return sorted(user.email for user in User.all())
+
+    def test_compaction_keeps_other_process_entries(self):
+        """ Entries journaled by another process survive a compaction
+        """
+        User(email="a").save()
+        subprocess.run(
+            [sys.executable, "-c",
+             "from models.user import User\n"
+             "User.load_from_file()\n"
+             "User(email='b').save()\n"],
+            check=True, env=dict(os.environ, PYTHONPATH=ROOT))
+        User.save_to_file()
+        self.assertEqual(self.emails(), ["a", "b"])
+        self.restart()
+        self.assertEqual(self.emails(), ["a", "b"])
+
+    def test_appends_after_torn_line(self):
+        """ A torn journal line only loses its own entry
+        """
+        for i in range(3):
+            User(email=str(i)).save()
+        with open(".db_User.journal", "a") as f:
+            f.write('{"op": "upsert", "id": "torn", "obj": {"em')
+        self.restart()
+        User(email="new").save()
+        self.assertEqual(User.count(), 4)
+        self.restart()
+        self.assertEqual(self.emails(), ["0", "1", "2", "new"])
+
+    def test_load_during_compaction(self):
+        """ A load racing with the snapshot swap sees every object
+        """
+        for i in range(10):
+            User(email="{:02}".format(i)).save()
+        User.save_to_file()
+        for i in range(10, 15):
+            User(email="{:02}".format(i)).save()
+
+        dumped = threading.Event()
+        snapshot_read = threading.Event()
+        real_dump = base.STORAGE_FORMAT.dump
+        real_load = base.STORAGE_FORMAT.load
+
+        def dump(objs_json, f):
+            """ Write the snapshot, then wait for the load to read
+            the old one before swapping it
+            """
+            real_dump(objs_json, f)
+            dumped.set()
+            snapshot_read.wait(2)
+
+        def load(f):
+            """ Read the snapshot, then give the swap time to run
+            """
+            yield from list(real_load(f))
+            snapshot_read.set()
+            time.sleep(0.3)
+
+        with mock.patch.object(base.STORAGE_FORMAT, "dump", dump), \
+                mock.patch.object(base.STORAGE_FORMAT, "load", load):
+            compaction = threading.Thread(target=User.save_to_file)
+            compaction.start()
+            self.assertTrue(dumped.wait(2))
+            User.load_from_file()
+            compaction.join()
+        self.assertEqual(User.count(), 15)
+        self.restart()
+        self.assertEqual(User.count(), 15)
+
+    def test_format_change_converts_snapshot(self):
+        """ Switching the snapshot format keeps the existing objects
+        and replays the journal on the converted snapshot
+        """
+        User(email="a").save()
+        User.save_to_file()
+        User(email="b").save()
+        other = next(f for f in FORMATS.values()
+                     if f is not base.STORAGE_FORMAT)
+        with mock.patch.object(base, "STORAGE_FORMAT", other):
+            self.restart()
+            self.assertEqual(self.emails(), ["a", "b"])
+            self.assertTrue(os.path.exists(User._snapshot_path()))
+            User(email="c").save()
+            self.restart()
+            self.assertEqual(self.emails(), ["a", "b", "c"])
+
+
+if __name__ == "__main__":
+    unittest.main()